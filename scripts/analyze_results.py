@@ -8,15 +8,23 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'utils'))
 
 # Import the functions from metrics.py
 from metrics import calculate_summary_statistics
+from result_store import read_results
 
-# Load the results
-results_df = pd.read_csv('experiments/results/tables/results_table.csv')
+RESULTS_TABLE_PATH = 'experiments/results/tables/results_table.parquet'
+LEGACY_RESULTS_PATH = 'experiments/results/tables/results_table.csv'
+required_columns = ['algorithm', 'execution_time', 'accuracy', 'factor1', 'factor2']
+
+# Load only the columns the analysis needs
+if os.path.exists(RESULTS_TABLE_PATH):
+    results_df = read_results(RESULTS_TABLE_PATH, columns=required_columns)
+else:
+    # Tables written before the Parquet result store
+    results_df = pd.read_csv(LEGACY_RESULTS_PATH, usecols=lambda column: column in required_columns)
 
 # Print the columns to inspect the available data
 print("Columns in results_df:", results_df.columns)
 
 # Check if the necessary columns exist
-required_columns = ['algorithm', 'execution_time', 'accuracy', 'factor1', 'factor2']
 missing_columns = [col for col in required_columns if col not in results_df.columns]
 if missing_columns:
     print(f"Missing columns in results_df: {missing_columns}")
@@ -1,44 +1,19 @@
-import pandas as pd
+import argparse
+import hashlib
 import json
+import pandas as pd
+import shutil
 import sys
 import os
-import re
+import time
 
 # Add src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils.data_processing import parse_parameters
+from utils.data_processing import parameter_columns, parse_parameters_column
 from utils.helper_functions import normalize_vector
 
-# Load the dataset
-df = pd.read_csv('data/raw/dataset.csv')
-
-# Inspect the parameters column
-print(df['parameters'].head())
-
-def parse_parameters(parameters):
-    """
-    Parse the parameters column from a string to a dictionary.
-    
-    Args:
-        parameters (str): The parameters as a string.
-        
-    Returns:
-        dict: The parameters as a dictionary.
-    """
-    try:
-        # Replace single quotes with double quotes
-        parameters = parameters.replace("'", '"')
-        
-        # Ensure keys are quoted
-        parameters = re.sub(r'(\w+):', r'"\1":', parameters)
-        
-        # Attempt to load the string
-        return json.loads(parameters)
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        print(f"Problematic string: {parameters}")
-        return {}
+MANIFEST_NAME = '_manifest.json'
 
 def filter_numerical_values(d):
     """
@@ -53,23 +28,122 @@ def filter_numerical_values(d):
     return [v for v in d.values() if isinstance(v, (int, float))]
 
 # Preprocess the dataset
-def preprocess_dataset(df):
+def preprocess_dataset(df, errors=None):
     # Drop rows with missing values
     df = df.dropna()
     
-    # Convert the parameters column to a dictionary
-    df['parameters'] = df['parameters'].apply(parse_parameters)
+    # Convert the parameters column to a dictionary, collecting rows that fail to parse
+    df['parameters'], report = parse_parameters_column(df['parameters'])
+    if errors is not None and not report.empty:
+        errors.append(report)
     
     # Extract numerical values for normalization
     df['normalized_parameters'] = df['parameters'].apply(lambda x: normalize_vector(filter_numerical_values(x)))
     
     return df
 
-# Preprocess the dataset
-preprocessed_df = preprocess_dataset(df)
+def file_sha256(path):
+    """Hash a file in blocks without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_parsed_manifest(parsed_path):
+    """Read the manifest of a parsed-parameter cache, or None if there is none."""
+    manifest_path = os.path.join(parsed_path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
 
-# Save the preprocessed data
-preprocessed_df.to_pickle('data/preprocessed/preprocessed_data.pkl')
-preprocessed_df.to_csv('data/preprocessed/preprocessed_data.csv', index=False)
+def preprocess_file(input_path, output_path, chunk_size=100000, errors_path=None, parsed_path=None, force=False):
+    """
+    Preprocess a raw dataset file in fixed-size chunks.
+    
+    Only one chunk is held in memory at a time; each preprocessed chunk is
+    appended to a temporary file that replaces the output once every chunk
+    has been written. With parsed_path, every chunk is also written as a
+    Parquet part file with one typed column per parameter, and a manifest
+    records the hash of the raw file. Preprocessing is skipped when that
+    cache was built from an identical raw file.
+    
+    Args:
+        input_path (str): The raw dataset CSV.
+        output_path (str): The preprocessed dataset CSV.
+        chunk_size (int): The number of rows read per chunk.
+        errors_path (str): Where to write the report of rows whose parameters could not be parsed.
+        parsed_path (str): The directory of the parsed-parameter Parquet cache.
+        force (bool): Whether to rebuild the outputs even if the cache is up to date.
+        
+    Returns:
+        int: The number of preprocessed rows.
+    """
+    source_sha256 = file_sha256(input_path)
+    if parsed_path is not None and not force and os.path.exists(output_path):
+        manifest = read_parsed_manifest(parsed_path)
+        if manifest is not None and manifest['source_sha256'] == source_sha256:
+            print(f"Preprocessed data is up to date with '{input_path}'.")
+            return manifest['rows']
+    
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    partial_path = output_path + '.partial'
+    if parsed_path is not None:
+        partial_parsed_path = parsed_path + '.partial'
+        shutil.rmtree(partial_parsed_path, ignore_errors=True)
+        os.makedirs(partial_parsed_path)
+    
+    rows = 0
+    parts = 0
+    errors = []
+    with open(partial_path, 'w', newline='') as output:
+        for index, chunk in enumerate(pd.read_csv(input_path, chunksize=chunk_size)):
+            if index == 0:
+                # Inspect the parameters column
+                print(chunk['parameters'].head())
+            preprocessed_chunk = preprocess_dataset(chunk, errors)
+            preprocessed_chunk.to_csv(output, header=(index == 0), index=False)
+            if parsed_path is not None:
+                parsed_chunk = preprocessed_chunk.drop(columns=['parameters']).join(parameter_columns(preprocessed_chunk['parameters']))
+                parsed_chunk.to_parquet(os.path.join(partial_parsed_path, f'part-{index:05d}.parquet'), index=False)
+                parts += 1
+            rows += len(preprocessed_chunk)
+    os.replace(partial_path, output_path)
+    
+    if parsed_path is not None:
+        with open(os.path.join(partial_parsed_path, MANIFEST_NAME), 'w') as f:
+            json.dump({
+                'source': input_path,
+                'source_sha256': source_sha256,
+                'rows': rows,
+                'parts': parts,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+            }, f, indent=2)
+        shutil.rmtree(parsed_path, ignore_errors=True)
+        os.replace(partial_parsed_path, parsed_path)
+    
+    if errors_path is not None:
+        report = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=['index', 'parameters', 'error'])
+        report.to_csv(errors_path, index=False)
+    if errors:
+        print(f"{sum(len(report) for report in errors)} rows had unparseable parameters")
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preprocess the raw dataset in chunks.")
+    parser.add_argument('--input', default='data/raw/dataset.csv', help="Raw dataset CSV")
+    parser.add_argument('--output', default='data/preprocessed/preprocessed_data.csv', help="Preprocessed dataset CSV")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows read per chunk")
+    parser.add_argument('--errors', default=None, help="CSV report of rows whose parameters could not be parsed")
+    parser.add_argument('--parsed', default='data/preprocessed/preprocessed_data.parquet', help="Directory of the parsed-parameter Parquet cache")
+    parser.add_argument('--force', action='store_true', help="Rebuild the outputs even if they are up to date")
+    args = parser.parse_args(argv)
+    
+    # Preprocess the dataset
+    rows = preprocess_file(args.input, args.output, chunk_size=args.chunk_size, errors_path=args.errors, parsed_path=args.parsed, force=args.force)
+    
+    print(f"Preprocessing complete. {rows} rows saved to '{args.output}' and '{args.parsed}'.")
 
-print("Preprocessing complete. Preprocessed data saved to 'data/preprocessed/preprocessed_data.pkl' and 'data/preprocessed/preprocessed_data.csv'.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,24 +1,439 @@
+import argparse
+import glob
+import hashlib
 import pandas as pd
 import json
+import multiprocessing
+import multiprocessing.connection
 import os
+import signal
 import sys
 import time
-import matplotlib.pyplot as plt
+from collections import deque
 
-# Add src directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add the repository root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from algorithms.grover import run_grover
-from algorithms.qpe import run_qpe
-from algorithms.shor import run_shor
-from utils.state_preparation import prepare_state
-from utils.helper_functions import create_superposition_state, measure_all
+# Algorithm modules are imported by the registry on first use
+from src.algorithms.registry import ALGORITHMS, BATCHABLE, resolve
+from src.utils.backend import configure_backend
+from src.utils.batch import run_circuits
+from src.utils.pipeline import run_pipeline, stage_times
+from src.utils.data_processing import parameters_from_columns, parse_parameter_string, parse_parameters_column
+from src.utils.result_cache import configure_result_cache, load_result, result_cache_config, result_key, store_result
+from src.utils.result_store import write_results
 
-# Load the preprocessed dataset
-train_df = pd.read_csv('data/preprocessed/preprocessed_data.csv')
+# Completed rows are appended here as they finish, so an interrupted run can resume
+CHECKPOINT_PATH = 'experiments/results/tables/results_checkpoint.jsonl'
+MANIFEST_PATH = 'experiments/results/tables/run_manifest.json'
+RESULTS_TABLE_PATH = 'experiments/results/tables/results_table.parquet'
+RESULTS_COUNTS_PATH = 'experiments/results/tables/results_counts.parquet'
+
+PARSED_DATASET_PATH = 'data/preprocessed/preprocessed_data.parquet'
+CSV_DATASET_PATH = 'data/preprocessed/preprocessed_data.csv'
+
+def _as_parameters(parameters):
+    # Rows loaded by load_dataset are already parsed; raw strings are still accepted
+    return parse_parameter_string(parameters) if isinstance(parameters, str) else parameters
+
+def _json_default(value):
+    # NumPy scalars returned by the algorithms
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def _init_worker(cache_config):
+    """Give each worker process one simulator thread so the workers do not oversubscribe the cores."""
+    configure_backend(max_parallel_threads=1)
+    # Spawned workers start from the default configuration
+    configure_result_cache(cache_config['directory'], cache_config['max_bytes'])
+
+def _cache_key(algorithm, parameters):
+    # Unseeded runs are not reproducible, so only seeded rows are memoized
+    if algorithm is None or parameters.get('seed') is None:
+        return None
+    return result_key(algorithm, parameters)
+
+def run_row(task):
+    """
+    Run the algorithm of a single dataset row.
+    
+    Problem types with a circuit builder run through the build -> compile ->
+    execute -> post-process pipeline, which times each stage; the others
+    call their entry point. Failures are recorded in the 'error' field
+    instead of stopping the whole experiment. Seeded rows are served from the
+    result cache when an identical run has completed before.
+    
+    The time limit is not enforced here: a signal cannot interrupt a running
+    simulator job, so run_rows stops the worker process of an overdue row.
+    
+    Args:
+        task (tuple): The problem type, the parameters (a dictionary or string) and the time limit in seconds (or None).
+        
+    Returns:
+        dict: The algorithm result with its name, execution and stage times, accuracy, error and whether it was cached.
+    """
+    problem_type, parameters, _ = task
+    parameters = _as_parameters(parameters)
+    algorithm, entry_point = ALGORITHMS.get(problem_type, (None, None))
+    
+    key = _cache_key(algorithm, parameters)
+    cached = load_result(key) if key is not None else None
+    if cached is not None:
+        return dict(cached, cached=True)
+    
+    start_time = time.time()
+    error = None
+    timings = {}
+    try:
+        if entry_point is None:
+            raise ValueError(f"Unknown problem type: {problem_type}")
+        if problem_type in BATCHABLE:
+            build_circuit, post_process = (resolve(target) for target in BATCHABLE[problem_type])
+            result = run_pipeline(build_circuit, post_process, parameters, timings)
+        else:
+            result = resolve(entry_point)(parameters)
+    except Exception as e:
+        result = {}
+        error = f"{type(e).__name__}: {e}"
+    execution_time = time.time() - start_time
+    
+    # Convert tuple result to dictionary
+    if isinstance(result, tuple):
+        result_dict = {'factor1': result[0], 'factor2': result[1]}
+    else:
+        result_dict = dict(result)
+    
+    result_dict.update({
+        'algorithm': algorithm,
+        'execution_time': execution_time,
+        'accuracy': result_dict.get('accuracy', None),
+        'error': error
+    })
+    result_dict.update(stage_times(timings))
+    if key is not None and error is None:
+        store_result(key, result_dict)
+    result_dict['cached'] = False
+    return result_dict
+
+def _failed_row(task, error, execution_time):
+    """Build the result of a row whose worker was stopped or lost."""
+    result = {
+        'algorithm': ALGORITHMS.get(task[0], (None, None))[0],
+        'execution_time': execution_time,
+        'accuracy': None,
+        'error': error
+    }
+    result.update(stage_times({}))
+    result['cached'] = False
+    return result
+
+def _worker_loop(connection, cache_config):
+    """Run the chunks of rows sent by the parent, reporting each row as it completes."""
+    _init_worker(cache_config)
+    connection.send(None)
+    while True:
+        chunk = connection.recv()
+        if chunk is None:
+            return
+        for position, task in chunk:
+            connection.send((position, run_row(task)))
+
+class _Worker:
+    """A worker process running rows one at a time, which the parent can stop at any point."""
+    
+    def __init__(self, context, cache_config):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_connection, cache_config), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+        # The (position, task) of the rows sent and not yet reported; the first one is running
+        self.rows = deque()
+        self.started = None
+    
+    @property
+    def deadline(self):
+        """The time by which the running row must finish, or None."""
+        if not self.rows or self.rows[0][1][2] is None:
+            return None
+        return self.started + self.rows[0][1][2]
+    
+    def send(self, chunk):
+        self.rows.extend(chunk)
+        self.started = time.time()
+        self.connection.send(chunk)
+    
+    def stop(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+def _run_in_workers(tasks, workers, chunk_size, report):
+    """
+    Run rows in worker processes, stopping any row that exceeds its time limit.
+    
+    Each worker reports its rows one by one, so the row it is running and the
+    time it started are always known. A row past its limit has its worker
+    terminated, which also stops a simulator job in progress, and is recorded
+    as a TimeoutError; the worker is replaced and the rest of its chunk is
+    handed out again.
+    """
+    # Forking after the simulator has started its threads can deadlock the workers
+    context = multiprocessing.get_context('spawn')
+    cache_config = result_cache_config()
+    queue = deque(enumerate(tasks))
+    pool = [_Worker(context, cache_config) for _ in range(min(workers, len(tasks)))]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            for i, worker in enumerate(pool):
+                deadline = worker.deadline
+                if deadline is not None and time.time() >= deadline:
+                    position, task = worker.rows.popleft()
+                    worker.stop()
+                    queue.extendleft(reversed(worker.rows))
+                    pool[i] = _Worker(context, cache_config)
+                    report(position, _failed_row(task, "TimeoutError: Row exceeded its time limit", task[2]))
+                    remaining -= 1
+                elif worker.ready and not worker.rows and queue:
+                    worker.send([queue.popleft() for _ in range(min(chunk_size, len(queue)))])
+            
+            deadlines = [worker.deadline for worker in pool if worker.deadline is not None]
+            wait_time = max(0, min(deadlines) - time.time()) if deadlines else None
+            ready = multiprocessing.connection.wait([worker.connection for worker in pool], timeout=wait_time)
+            for i, worker in enumerate(pool):
+                if worker.connection not in ready:
+                    continue
+                try:
+                    message = worker.connection.recv()
+                except EOFError:
+                    # The worker died; its running row is recorded and the rest run elsewhere
+                    worker.process.join()
+                    if worker.rows:
+                        position, task = worker.rows.popleft()
+                        error = f"RuntimeError: Worker process exited with code {worker.process.exitcode}"
+                        report(position, _failed_row(task, error, time.time() - worker.started))
+                        remaining -= 1
+                    queue.extendleft(reversed(worker.rows))
+                    worker.stop()
+                    pool[i] = _Worker(context, cache_config)
+                    continue
+                worker.started = time.time()
+                if message is None:
+                    worker.ready = True
+                    continue
+                worker.rows.popleft()
+                report(*message)
+                remaining -= 1
+    finally:
+        for worker in pool:
+            worker.stop()
+
+def run_rows(tasks, workers=None, chunk_size=None, callback=None):
+    """
+    Run dataset rows across a pool of worker processes.
+    
+    Rows are handed to the workers in chunks. Each row is reported to the
+    callback as soon as it completes, so a slow row does not hold back the
+    rows finished after it; the returned list is in the order of the tasks. A row that exceeds its time limit is stopped by
+    terminating its worker process. With a single worker and no time limits
+    the rows run in this process.
+    
+    Args:
+        tasks (list): The (problem type, parameters, time limit) of each row.
+        workers (int): The number of worker processes (defaults to the CPU count).
+        chunk_size (int): The number of rows sent to a worker at a time.
+        callback (callable): Called with the position and result of each row as it completes.
+        
+    Returns:
+        list: The result of each row, in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    timed = any(task[2] is not None for task in tasks)
+    if (workers == 1 and not timed) or not tasks:
+        return _collect(map(run_row, tasks), callback)
+    
+    if chunk_size is None:
+        # A few chunks per worker balances uneven row costs against dispatch overhead
+        chunk_size = max(1, len(tasks) // (workers * 4))
+    
+    results = [None] * len(tasks)
+    def report(position, result):
+        results[position] = result
+        if callback is not None:
+            callback(position, result)
+    
+    _run_in_workers(tasks, workers, chunk_size, report)
+    return results
+
+def _collect(results, callback):
+    """Gather results as they arrive, reporting each one to the callback."""
+    collected = []
+    for position, result in enumerate(results):
+        if callback is not None:
+            callback(position, result)
+        collected.append(result)
+    return collected
+
+def run_batched_rows(tasks, shots=1000, callback=None):
+    """
+    Run the batchable rows as one multi-circuit job per (algorithm, qubit count) group.
+    
+    All circuits are built first, each group is submitted as a single job, and
+    the counts are demultiplexed back to their rows. A row whose circuit cannot
+    be built, whose group's job fails, or whose counts cannot be post-processed
+    is left out so the regular runner retries it and records its error. The
+    execution time of a row is its share of the group's job time, and so are
+    its compile and execute stage times; row time limits do not apply to
+    batched jobs.
+    
+    Unseeded rows are further grouped by shot count. The simulator derives a
+    different seed for every circuit of a seeded job, so a circuit's counts
+    would depend on its position in the job; seeded rows therefore run as
+    jobs of their own, which reproduces run_row exactly. Seeded rows are
+    deduplicated by their result key: cached rows are not rerun, and
+    identical rows of the sweep are simulated once and share the result.
+    
+    Args:
+        tasks (list): The (problem type, parameters, time limit) of each row.
+        shots (int): The number of shots per circuit for rows without a 'shots' parameter.
+        callback (callable): Called with the position and result of each row as its group completes.
+        
+    Returns:
+        dict: The result of each batched row, keyed by its position in tasks.
+    """
+    groups = {}
+    results = {}
+    # Positions of the rows repeating an earlier seeded row, by result key
+    duplicates = {}
+    for index, (problem_type, parameters, timeout) in enumerate(tasks):
+        if problem_type not in BATCHABLE:
+            continue
+        try:
+            build_circuit = resolve(BATCHABLE[problem_type][0])
+            parameters = _as_parameters(parameters)
+            key = _cache_key(ALGORITHMS[problem_type][0], parameters)
+            if key in duplicates:
+                duplicates[key].append(index)
+                continue
+            cached = load_result(key) if key is not None else None
+            if cached is not None:
+                results[index] = dict(cached, cached=True)
+                if callback is not None:
+                    callback(index, results[index])
+                continue
+            start_time = time.time()
+            qc = build_circuit(parameters)
+            build_time = time.time() - start_time
+        except Exception:
+            continue
+        if key is not None:
+            duplicates[key] = []
+        # A seeded row's key gives it a job of its own
+        group = (problem_type, qc.num_qubits, parameters.get('shots', shots), parameters.get('seed'), key)
+        groups.setdefault(group, []).append((index, parameters, qc, key, build_time))
+    
+    for (problem_type, num_qubits, group_shots, seed, _), rows in groups.items():
+        post_process = resolve(BATCHABLE[problem_type][1])
+        group_timings = {}
+        start_time = time.time()
+        try:
+            group_counts = run_circuits([row[2] for row in rows], shots=group_shots, seed=seed, timings=group_timings)
+        except Exception:
+            continue
+        execution_time = (time.time() - start_time) / len(rows)
+        for (index, parameters, qc, key, build_time), counts in zip(rows, group_counts):
+            start_time = time.time()
+            try:
+                accuracy = post_process(counts, parameters)
+            except Exception:
+                continue
+            timings = {stage: group_timings[stage] / len(rows) for stage in ('compile', 'execute')}
+            timings.update({'build': build_time, 'post_process': time.time() - start_time})
+            result = {
+                'result_counts': counts,
+                'algorithm': ALGORITHMS[problem_type][0],
+                'execution_time': execution_time,
+                'accuracy': accuracy,
+                'error': None
+            }
+            result.update(stage_times(timings))
+            if key is not None:
+                store_result(key, result)
+            results[index] = dict(result, cached=False)
+            if callback is not None:
+                callback(index, results[index])
+            for duplicate in duplicates.get(key, ()):
+                results[duplicate] = dict(result, cached=True)
+                if callback is not None:
+                    callback(duplicate, results[duplicate])
+    return results
+
+def row_keys(tasks):
+    """
+    Identify each row by a hash of its problem type and parameters.
+    
+    Identical rows are told apart by their occurrence number, so keys stay
+    valid when other rows are added to or reordered in the dataset.
+    
+    Args:
+        tasks (list): The (problem type, parameters, time limit) of each row.
+        
+    Returns:
+        list: The key of each row.
+    """
+    occurrences = {}
+    keys = []
+    for problem_type, parameters, _ in tasks:
+        if not isinstance(parameters, str):
+            parameters = json.dumps(parameters, sort_keys=True, default=_json_default)
+        digest = hashlib.sha256(f'{problem_type}|{parameters}'.encode()).hexdigest()
+        occurrences[digest] = occurrences.get(digest, 0) + 1
+        keys.append(f'{digest}:{occurrences[digest]}')
+    return keys
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    """
+    Read the results of rows completed by earlier runs.
+    
+    Rows that ended in an error are not returned, so they run again. A line
+    cut short by a crash is removed from the file.
+    
+    Args:
+        path (str): The checkpoint file.
+        
+    Returns:
+        dict: The result of each completed row, keyed by row key.
+    """
+    completed = {}
+    if not os.path.exists(path):
+        return completed
+    with open(path) as f:
+        lines = f.read().split('\n')
+    if lines[-1]:
+        os.truncate(path, os.path.getsize(path) - len(lines[-1].encode()))
+    
+    for line in lines[:-1]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if record['result'].get('error') is None:
+            completed[record['key']] = record['result']
+        else:
+            completed.pop(record['key'], None)
+    return completed
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Atomically replace the run manifest."""
+    manifest['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
 
 # Function to run an experiment
-def run_experiment(df):
+def run_experiment(df, workers=None, chunk_size=None, timeout=None, batch=True, resume=True, shots=None, seed=None):
     # Create directories for experiment results
     os.makedirs('experiments/configs', exist_ok=True)
     os.makedirs('experiments/logs', exist_ok=True)
@@ -39,50 +454,51 @@ def run_experiment(df):
         f.write("Experiment started...\n")
     
     # Example: Run algorithms and save results
-    results = []
-    for index, row in df.iterrows():
-        problem_type = row['problem_type']
-        parameters = json.loads(row['parameters'].replace("'", '"'))
-        
-        # Prepare the state
-        prepared_state = prepare_state(parameters)
-        
-        start_time = time.time()
-        if problem_type == 'Search':
-            result = run_grover(parameters)
-            algorithm = 'Grover'
-            accuracy = result.get('accuracy', None)
-        elif problem_type == 'Phase Estimation':
-            result = run_qpe(parameters)
-            algorithm = 'QPE'
-            accuracy = result.get('accuracy', None)
-        elif problem_type == 'Factorization':
-            result = run_shor(parameters) # Pass parameters instead of prepared_state
-            algorithm = 'Shor'
-            accuracy = result.get('accuracy', None)
-        
-        execution_time = time.time() - start_time
-        
-        # Example usage of helper functions
-        superposition_circuit = create_superposition_state(len(parameters))
-        measured_circuit = measure_all(superposition_circuit)
-        
-        # Convert tuple result to dictionary
-        if isinstance(result, tuple):
-            result_dict = {'factor1': result[0], 'factor2': result[1]}
-        else:
-            result_dict = result
-        
-        result_dict.update({
-            'algorithm': algorithm,
-            'execution_time': execution_time,
-            'accuracy': accuracy
-        })
-        
-        results.append(result_dict)
+    # Shots and seed given for the whole run apply to every row
+    overrides = {name: value for name, value in (('shots', shots), ('seed', seed)) if value is not None}
+    parameters_column = [{**_as_parameters(parameters), **overrides} if overrides else parameters for parameters in df['parameters']]
+    tasks = [(problem_type, parameters, timeout) for problem_type, parameters in zip(df['problem_type'], parameters_column)]
+    keys = row_keys(tasks)
+    if not resume and os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+    completed = load_checkpoint()
+    pending = [index for index, key in enumerate(keys) if key not in completed]
+    
+    manifest = {
+        'experiment_name': config['experiment_name'],
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'rows': len(tasks),
+        'resumed_rows': len(tasks) - len(pending),
+        'checkpoint': CHECKPOINT_PATH,
+        'status': 'running'
+    }
+    write_manifest(manifest)
+    
+    # Rows are checkpointed in the order they complete and put back in dataset order below
+    try:
+        with open(CHECKPOINT_PATH, 'a') as checkpoint:
+            def record(index, result):
+                completed[keys[index]] = result
+                checkpoint.write(json.dumps({'key': keys[index], 'result': result}, default=_json_default) + '\n')
+                checkpoint.flush()
+            
+            pending_tasks = [tasks[index] for index in pending]
+            batched = run_batched_rows(pending_tasks, callback=lambda position, result: record(pending[position], result)) if batch else {}
+            remaining = [index for position, index in enumerate(pending) if position not in batched]
+            run_rows([tasks[index] for index in remaining], workers=workers, chunk_size=chunk_size,
+                     callback=lambda position, result: record(remaining[position], result))
+    except BaseException:
+        manifest['status'] = 'interrupted'
+        manifest['completed_rows'] = len(completed)
+        write_manifest(manifest)
+        raise
+    results = [completed[key] for key in keys]
+    
+    manifest['status'] = 'complete'
+    manifest['failed_rows'] = sum(result.get('error') is not None for result in results)
+    write_manifest(manifest)
     
-    results_df = pd.DataFrame(results)
-    results_df.to_csv('experiments/results/tables/results_table.csv', index=False)
+    write_results(results, RESULTS_TABLE_PATH, RESULTS_COUNTS_PATH)
     
     # Example: Save a report
     with open('experiments/results/reports/experiment_report.md', 'w') as f:
@@ -91,5 +507,61 @@ def run_experiment(df):
     
     print("Experiment complete. Results saved in the 'experiments' folder.")
 
-# Run the experiment
-run_experiment(train_df)
\ No newline at end of file
+def load_dataset(path):
+    """
+    Load the preprocessed dataset with its parameters already parsed.
+    
+    A directory of Parquet part files written by preprocess_dataset.py holds
+    one typed column per parameter, so no parameter strings are parsed. A
+    CSV has its parameter strings parsed once per distinct string.
+    
+    Args:
+        path (str): The parsed-parameter Parquet directory or the preprocessed CSV.
+        
+    Returns:
+        pd.DataFrame: The dataset with a 'parameters' column of dictionaries.
+    """
+    if os.path.isdir(path):
+        parts = []
+        for part_path in sorted(glob.glob(os.path.join(path, 'part-*.parquet'))):
+            # Rebuild per part, as parts can hold different parameter columns
+            part = pd.read_parquet(part_path)
+            part['parameters'] = parameters_from_columns(part)
+            parts.append(part)
+        return pd.concat(parts, ignore_index=True)
+    
+    df = pd.read_csv(path)
+    df['parameters'], _ = parse_parameters_column(df['parameters'])
+    return df
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the quantum algorithm benchmark on the preprocessed dataset.")
+    parser.add_argument('--input', default=None, help="Parsed-parameter Parquet directory or preprocessed CSV (defaults to the Parquet cache if present)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (defaults to the CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Rows sent to a worker at a time")
+    parser.add_argument('--timeout', type=float, default=None, help="Time limit per row in seconds")
+    parser.add_argument('--no-batch', action='store_true', help="Run every row on its own instead of grouping circuits into shared jobs")
+    parser.add_argument('--no-resume', action='store_true', help="Discard the checkpoint and run every row again")
+    parser.add_argument('--shots', type=int, default=None, help="Shots per circuit for every row")
+    parser.add_argument('--seed', type=int, default=None, help="Simulator seed for every row; seeded rows are memoized")
+    parser.add_argument('--result-cache', default='experiments/cache/results', help="Directory of the memoized results of seeded rows")
+    parser.add_argument('--result-cache-mb', type=int, default=1024, help="Size bound of the result cache in megabytes")
+    parser.add_argument('--no-result-cache', action='store_true', help="Do not memoize results")
+    args = parser.parse_args(argv)
+    
+    if not args.no_result_cache:
+        configure_result_cache(args.result_cache, max_bytes=args.result_cache_mb * 2 ** 20)
+    
+    # Load the preprocessed dataset
+    if args.input is None:
+        args.input = PARSED_DATASET_PATH if os.path.isdir(PARSED_DATASET_PATH) else CSV_DATASET_PATH
+    train_df = load_dataset(args.input)
+    
+    # Run the experiment
+    run_experiment(train_df, workers=args.workers, chunk_size=args.chunk_size, timeout=args.timeout, batch=not args.no_batch, resume=not args.no_resume,
+                   shots=args.shots, seed=args.seed)
+
+if __name__ == "__main__":
+    # Exit through the interpreter on SIGTERM, so the workers are stopped and the manifest is updated
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    main()
\ No newline at end of file
@@ -1,5 +1,7 @@
-from qiskit import QuantumCircuit, Aer, transpile, execute
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
 def amplitude_amplification(parameters):
     """
@@ -39,14 +41,14 @@ def amplitude_amplification(parameters):
     qc.measure(range(num_qubits), range(num_qubits))
     
     # Execute the circuit on the Aer simulator
-    simulator = Aer.get_backend('qasm_simulator')
-    compiled_circuit = transpile(qc, simulator)
-    job = execute(compiled_circuit, simulator, shots=1000)
+    simulator = get_backend()
+    compiled_circuit = cached_transpile(qc, simulator)
+    job = simulator.run(compiled_circuit, shots=1000)
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='amplitude_amplification', plot=parameters.get('plot'))
     
     return counts
 
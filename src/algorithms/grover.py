@@ -1,66 +1,339 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
+from functools import lru_cache
+from math import floor, pi, sqrt
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile, mark_compiled
+from ..utils.visualization import plot_counts
 
-def grover_algorithm(parameters):
+# Parameters that name the marked states of a search
+_TARGET_KEYS = ('targets', 'target', 'target_state')
+
+def _bitstring(target, num_qubits):
+    """Convert a marked item index or bitstring to a bitstring of the search width."""
+    if isinstance(target, str):
+        if len(target) != num_qubits or set(target) - {'0', '1'}:
+            raise ValueError(f"Target state {target!r} is not a {num_qubits}-bit string")
+        return target
+    target = int(target)
+    if not 0 <= target < 2 ** num_qubits:
+        raise ValueError(f"Target {target} is outside a search space of {2 ** num_qubits} items")
+    return format(target, f'0{num_qubits}b')
+
+def grover_targets(parameters):
     """
-    Grover's algorithm implementation.
+    Get the search width and the marked states of a Grover search.
+    
+    The width is 'num_qubits', or the number of qubits indexing 'n' items.
+    The marked states are 'targets' (bitstrings or item indices), 'target'
+    (an item index) or 'target_state' (a bitstring).
     
     Args:
         parameters (dict): The parameters for Grover's algorithm.
         
     Returns:
-        dict: The result counts from the execution.
+        tuple: The number of qubits and the sorted marked bitstrings.
     """
-    target_state = parameters.get('target_state', '11')
-    num_qubits = parameters.get('num_qubits', 2)
+    if 'num_qubits' in parameters:
+        num_qubits = int(parameters['num_qubits'])
+    elif 'n' in parameters:
+        num_qubits = max(1, (int(parameters['n']) - 1).bit_length())
+    elif isinstance(parameters.get('target_state'), str):
+        num_qubits = len(parameters['target_state'])
+    else:
+        num_qubits = 2
     
-    # Create a Quantum Circuit with num_qubits qubits and num_qubits classical bits
-    qc = QuantumCircuit(num_qubits, num_qubits)
+    if 'targets' in parameters:
+        targets = parameters['targets']
+    elif 'target' in parameters:
+        targets = [parameters['target']]
+    else:
+        targets = [parameters.get('target_state', '1' * num_qubits)]
+    return num_qubits, tuple(sorted({_bitstring(target, num_qubits) for target in targets}))
+
+def optimal_iterations(num_qubits, num_targets):
+    """
+    Return the number of Grover iterations, floor(pi/4 * sqrt(N/M)), for M marked states out of N.
+    """
+    if num_targets == 0:
+        return 0
+    return floor(pi / 4 * sqrt(2 ** num_qubits / num_targets))
+
+def _flip_phase(qc, bitstring):
+    """Flip the phase of a single basis state with a multi-controlled phase gate."""
+    num_qubits = qc.num_qubits
+    zeros = [q for q in range(num_qubits) if bitstring[num_qubits - 1 - q] == '0']
+    if zeros:
+        qc.x(zeros)
+    if num_qubits == 1:
+        qc.z(0)
+    else:
+        qc.mcp(pi, list(range(num_qubits - 1)), num_qubits - 1)
+    if zeros:
+        qc.x(zeros)
+
+def phase_oracle(num_qubits, targets, backend=None):
+    """
+    Build a phase oracle marking the given basis states.
     
-    # Apply Hadamard gates
+    Args:
+        num_qubits (int): The search width.
+        targets (list): The marked bitstrings.
+        backend (AerSimulator): If given, the oracle is assembled for this backend from
+            X gates and the phase flip of |1...1>, which is compiled once per width.
+        
+    Returns:
+        QuantumCircuit: The oracle.
+    """
+    qc = QuantumCircuit(num_qubits, name="oracle")
+    if backend is None:
+        for target in targets:
+            _flip_phase(qc, target)
+        return qc
+    
+    compiled_flip = cached_transpile(phase_oracle(num_qubits, ['1' * num_qubits]), backend)
+    for target in targets:
+        zeros = [q for q in range(num_qubits) if target[num_qubits - 1 - q] == '0']
+        if zeros:
+            qc.x(zeros)
+        qc.compose(compiled_flip, inplace=True)
+        if zeros:
+            qc.x(zeros)
+    return mark_compiled(qc, backend)
+
+@lru_cache(maxsize=None)
+def diffuser(num_qubits):
+    """
+    Build the diffusion operator, the inversion about the uniform superposition.
+    
+    The circuit is shared by all searches of the same width and must not be
+    modified in place; compiled_grover_search transpiles it once per width.
+    """
+    qc = QuantumCircuit(num_qubits, name="diffuser")
     qc.h(range(num_qubits))
+    _flip_phase(qc, '0' * num_qubits)
+    qc.h(range(num_qubits))
+    return qc
+
+def grover_search(num_qubits, oracle, iterations=None):
+    """
+    Build the measured Grover circuit for a phase oracle.
     
-    # Oracle for target_state (example for |11>)
-    if target_state == '11':
-        qc.cz(0, 1)
+    Args:
+        num_qubits (int): The search width.
+        oracle (QuantumCircuit): The phase oracle on num_qubits qubits.
+        iterations (int): The number of oracle and diffusion steps (defaults to the optimum for one marked state).
+        
+    Returns:
+        QuantumCircuit: The Grover circuit.
+    """
+    if iterations is None:
+        iterations = optimal_iterations(num_qubits, 1)
     
-    # Apply Hadamard gates again
+    qc = QuantumCircuit(num_qubits, num_qubits)
     qc.h(range(num_qubits))
+    for _ in range(iterations):
+        qc.compose(oracle, inplace=True)
+        qc.compose(diffuser(num_qubits), inplace=True)
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+def compiled_grover_search(num_qubits, oracle, iterations, backend):
+    """
+    Assemble the measured Grover circuit for a backend from compiled pieces.
     
-    # Measure the qubits
+    The oracle and the diffuser are transpiled through the transpile cache, so
+    the diffuser is compiled once per width and backend configuration and is
+    reused by every target; an oracle built by phase_oracle for the backend
+    is used as it is. The iterations are composed from the compiled pieces,
+    and the full circuit is never transpiled.
+    
+    Args:
+        num_qubits (int): The search width.
+        oracle (QuantumCircuit): The phase oracle on num_qubits qubits.
+        iterations (int): The number of oracle and diffusion steps (defaults to the optimum for one marked state).
+        backend (AerSimulator): The backend the circuit will run on.
+        
+    Returns:
+        QuantumCircuit: The compiled Grover circuit, marked as compiled for the backend.
+    """
+    if iterations is None:
+        iterations = optimal_iterations(num_qubits, 1)
+    compiled_oracle = cached_transpile(oracle, backend)
+    compiled_diffuser = cached_transpile(diffuser(num_qubits), backend)
+    
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(range(num_qubits))
+    for _ in range(iterations):
+        qc.compose(compiled_oracle, inplace=True)
+        qc.compose(compiled_diffuser, inplace=True)
     qc.measure(range(num_qubits), range(num_qubits))
+    return mark_compiled(qc, backend)
+
+def build_grover_circuit(parameters):
+    """
+    Build the measured Grover circuit for the given parameters.
+    
+    The oracle marks every target, and the number of iterations is the
+    optimum for the number of targets unless 'iterations' is given. The
+    circuit is assembled from pieces compiled for the backend run_circuits
+    uses, so running it there does not transpile it again.
     
-    # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
+    Args:
+        parameters (dict): The parameters for Grover's algorithm.
+        
+    Returns:
+        QuantumCircuit: The Grover circuit.
+    """
+    num_qubits, targets = grover_targets(parameters)
+    iterations = parameters.get('iterations', optimal_iterations(num_qubits, len(targets)))
+    simulator = get_backend(max_parallel_experiments=0)
+    return compiled_grover_search(num_qubits, phase_oracle(num_qubits, targets, simulator), iterations, simulator)
+
+def grover_accuracy(counts, parameters):
+    """
+    Compute the fraction of shots that found a target state.
+    
+    Args:
+        counts (dict): The result counts.
+        parameters (dict): The parameters for Grover's algorithm.
+        
+    Returns:
+        float: The accuracy.
+    """
+    _, targets = grover_targets(parameters)
+    total_counts = sum(counts.values())
+    correct_counts = sum(counts.get(target, 0) for target in targets)
+    return correct_counts / total_counts if total_counts > 0 else 0
+
+@lru_cache(maxsize=None)
+def grover_template(num_qubits, iterations):
+    """
+    Build a measured single-target Grover circuit whose target is a parameter.
+    
+    Qubit q of the oracle is flipped by rx(pi * (1 - target[q])) around the
+    multi-controlled phase gate, so binding target[q] to the bits of a marked
+    state turns the template into the search for that state. The circuit is
+    shared and must not be modified in place.
+    
+    Args:
+        num_qubits (int): The search width.
+        iterations (int): The number of oracle and diffusion steps.
+        
+    Returns:
+        tuple: The template circuit and its target ParameterVector.
+    """
+    target = ParameterVector('target', num_qubits)
+    oracle = QuantumCircuit(num_qubits, name="oracle")
+    for q in range(num_qubits):
+        oracle.rx(pi * (1 - target[q]), q)
+    _flip_phase(oracle, '1' * num_qubits)
+    for q in range(num_qubits):
+        oracle.rx(pi * (1 - target[q]), q)
+    return grover_search(num_qubits, oracle, iterations), target
+
+def grover_batch(num_qubits, targets, iterations=None, shots=1000, seed=None):
+    """
+    Search for each of many targets of the same width in one simulator job.
+    
+    The parameterized template, with its H layer and diffusers, is compiled
+    once; every target is a parameter binding of the compiled circuit, and
+    all bindings run as a single job.
+    
+    Args:
+        num_qubits (int): The search width.
+        targets (list): The marked state of each search, as a bitstring or item index.
+        iterations (int): The number of oracle and diffusion steps (defaults to the optimum for one marked state).
+        shots (int): The number of shots per search.
+        seed (int): The simulator seed of the job; the simulator derives a different seed for each search, so its counts depend on its position in targets.
+        
+    Returns:
+        list: The result counts of each search, in the order of the targets.
+    """
+    if not targets:
+        return []
+    if iterations is None:
+        iterations = optimal_iterations(num_qubits, 1)
+    bitstrings = [_bitstring(target, num_qubits) for target in targets]
+    template, target = grover_template(num_qubits, iterations)
+    
+    simulator = get_backend(max_parallel_experiments=0)
+    compiled_circuit = cached_transpile(template, simulator)
+    # Qubit q holds the bit at position num_qubits - 1 - q of the bitstring
+    binds = {target[q]: [float(bitstring[num_qubits - 1 - q]) for bitstring in bitstrings] for q in range(num_qubits)}
+    result = simulator.run(compiled_circuit, shots=shots, seed_simulator=seed, parameter_binds=[binds]).result()
+    return [result.get_counts(i) for i in range(len(bitstrings))]
+
+def run_grover_batch(parameters):
+    """
+    Run Grover's algorithm for each target of the given parameters in one job.
+    
+    Args:
+        parameters (dict): The search width ('num_qubits' or 'n'), the 'targets'
+            (every state of the width if omitted), and optional 'iterations',
+            'shots' and 'seed'.
+            
+    Returns:
+        list: The target, result counts and accuracy of each search.
+    """
+    num_qubits, _ = grover_targets({key: value for key, value in parameters.items() if key not in _TARGET_KEYS})
+    targets = parameters.get('targets', range(2 ** num_qubits))
+    all_counts = grover_batch(num_qubits, list(targets), iterations=parameters.get('iterations'),
+                              shots=parameters.get('shots', 1000), seed=parameters.get('seed'))
+    
+    results = []
+    for target, counts in zip(targets, all_counts):
+        accuracy = grover_accuracy(counts, {'num_qubits': num_qubits, 'targets': [target]})
+        results.append({'target': target, 'result_counts': counts, 'accuracy': accuracy})
+    return results
+
+def grover_algorithm(parameters, oracle=None):
+    """
+    Grover's algorithm implementation.
+    
+    Args:
+        parameters (dict): The parameters for Grover's algorithm.
+        oracle (QuantumCircuit): A phase oracle to search with instead of one built from the targets.
+        
+    Returns:
+        dict: The result counts from the execution.
+    """
+    # Execute the circuit on the AerSimulator, the backend build_grover_circuit compiles for
+    simulator = get_backend(max_parallel_experiments=0)
+    if oracle is None:
+        compiled_circuit = build_grover_circuit(parameters)
+    else:
+        compiled_circuit = compiled_grover_search(oracle.num_qubits, oracle, parameters.get('iterations'), simulator)
+    job = simulator.run(compiled_circuit, shots=parameters.get('shots', 1000), seed_simulator=parameters.get('seed'))
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='grover', plot=parameters.get('plot'))
     
     return counts
 
-def run_grover(parameters):
+def run_grover(parameters, oracle=None):
     """
     Run Grover's algorithm with the given parameters.
     
     Args:
-        parameters (dict): The parameters for Grover's algorithm.
+        parameters (dict): The parameters for Grover's algorithm, or the number of qubits when an oracle is given.
+        oracle (QuantumCircuit): A phase oracle to search with instead of one built from the targets.
         
     Returns:
         dict: The result counts and accuracy from the execution.
     """
+    if not isinstance(parameters, dict):
+        parameters = {'num_qubits': parameters}
     
     # Run Grover's algorithm with the given parameters
-    result_counts = grover_algorithm(parameters)
+    result_counts = grover_algorithm(parameters, oracle=oracle)
     
-    # Calculate accuracy
-    target_state = parameters.get('target_state', '11')
-    total_counts = sum(result_counts.values())
-    correct_counts = result_counts.get(target_state, 0)
-    accuracy = correct_counts / total_counts if total_counts > 0 else 0
+    # Calculate accuracy; a custom oracle without targets has no known answer
+    if oracle is None or any(key in parameters for key in _TARGET_KEYS):
+        accuracy = grover_accuracy(result_counts, parameters)
+    else:
+        accuracy = None
     
     return {'result_counts': result_counts, 'accuracy': accuracy}
\ No newline at end of file
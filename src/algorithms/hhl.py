@@ -1,9 +1,10 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
 from qiskit.circuit.library import QFT
 from qiskit.extensions import UnitaryGate
 import numpy as np
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
 def create_hhl_circuit(matrix, vector, num_ancillae):
     """
@@ -57,7 +58,7 @@ def create_hhl_circuit(matrix, vector, num_ancillae):
     
     return qc
 
-def run_hhl(matrix, vector, num_ancillae):
+def run_hhl(matrix, vector, num_ancillae, plot=None):
     """
     Run the HHL algorithm with the given matrix and vector.
     
@@ -65,6 +66,7 @@ def run_hhl(matrix, vector, num_ancillae):
         matrix (np.ndarray): The matrix A.
         vector (np.ndarray): The vector b.
         num_ancillae (int): The number of ancilla qubits for QPE.
+        plot (bool): Whether to plot the histogram (defaults to the global plotting mode).
         
     Returns:
         dict: The result counts and accuracy from the execution.
@@ -74,13 +76,13 @@ def run_hhl(matrix, vector, num_ancillae):
     qc = create_hhl_circuit(matrix, vector, num_ancillae)
     
     # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
+    simulator = get_backend()
+    compiled_circuit = cached_transpile(qc, simulator)
     job = simulator.run(compiled_circuit, shots=1000)
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='hhl', plot=plot)
     
     return counts
@@ -1,23 +1,76 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-from qiskit.circuit import Parameter
+from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 import numpy as np
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
-def qaoa_algorithm(parameters):
+def problem_graph(parameters):
     """
-    QAOA algorithm implementation.
+    Read the weighted MaxCut graph from the parameters.
+    
+    The graph is given either as 'graph', a list of (i, j) or (i, j, weight)
+    edges with optional matching 'weights', or as 'adjacency', a dense NumPy
+    or SciPy sparse matrix whose upper triangle holds the edge weights.
+    Without a graph, the complete graph on num_qubits nodes with unit weights is used.
     
     Args:
         parameters (dict): The parameters for QAOA algorithm.
         
     Returns:
-        dict: The result counts from the execution.
+        tuple: The number of qubits, an (edges, 2) integer array and the edge weights.
     """
-    num_qubits = parameters.get('num_qubits', 2)
-    p = parameters.get('p', 1)  # Number of QAOA layers
-    gamma = Parameter('γ')
-    beta = Parameter('β')
+    if parameters.get('adjacency') is not None:
+        adjacency = parameters['adjacency']
+        if hasattr(adjacency, 'tocoo'):
+            from scipy.sparse import triu
+            upper = triu(adjacency, k=1).tocoo()
+            edges = np.column_stack([upper.row, upper.col])
+            weights = np.asarray(upper.data, dtype=float)
+        else:
+            adjacency = np.asarray(adjacency, dtype=float)
+            rows, cols = np.nonzero(np.triu(adjacency, k=1))
+            edges = np.column_stack([rows, cols])
+            weights = adjacency[rows, cols]
+        num_qubits = parameters.get('num_qubits', adjacency.shape[0])
+    elif parameters.get('graph') is not None:
+        graph = list(parameters['graph'])
+        edges = np.array([edge[:2] for edge in graph], dtype=int).reshape(-1, 2)
+        if parameters.get('weights') is not None:
+            weights = np.asarray(parameters['weights'], dtype=float)
+        else:
+            weights = np.array([edge[2] if len(edge) > 2 else 1.0 for edge in graph], dtype=float)
+        num_qubits = parameters.get('num_qubits', int(edges.max()) + 1 if len(edges) else 0)
+    else:
+        num_qubits = parameters.get('num_qubits', 2)
+        edges = np.array([(i, j) for i in range(num_qubits) for j in range(i+1, num_qubits)], dtype=int).reshape(-1, 2)
+        weights = np.ones(len(edges))
+    
+    if len(weights) != len(edges):
+        raise ValueError(f"Got {len(weights)} weights for {len(edges)} edges")
+    return num_qubits, edges.astype(int), weights
+
+def build_qaoa_circuit(num_qubits, p, edges=None, weights=None, measure=True):
+    """
+    Build the parameterized QAOA circuit with independent angles per layer.
+    
+    Args:
+        num_qubits (int): The number of qubits.
+        p (int): The number of QAOA layers.
+        edges (np.ndarray): The graph edges; defaults to the complete graph.
+        weights (np.ndarray): The edge weights; defaults to unit weights.
+        measure (bool): Whether to measure all qubits; otherwise the outcome probabilities are saved.
+        
+    Returns:
+        QuantumCircuit: The circuit with parameters γ[0..p-1] and β[0..p-1].
+    """
+    if edges is None:
+        num_qubits, edges, weights = problem_graph({'num_qubits': num_qubits})
+    if weights is None:
+        weights = np.ones(len(edges))
+    
+    gamma = ParameterVector('γ', p)
+    beta = ParameterVector('β', p)
     
     # Create a Quantum Circuit with num_qubits qubits and num_qubits classical bits
     qc = QuantumCircuit(num_qubits, num_qubits)
@@ -26,34 +79,216 @@ def qaoa_algorithm(parameters):
     qc.h(range(num_qubits))
     
     # QAOA layers
-    for _ in range(p):
-        # Problem unitary (example for a simple MaxCut problem)
-        for i in range(num_qubits):
-            for j in range(i+1, num_qubits):
-                qc.cx(i, j)
-                qc.rz(2 * gamma, j)
-                qc.cx(i, j)
+    for layer in range(p):
+        # Problem unitary: one ZZ rotation per weighted edge
+        for (i, j), weight in zip(edges, weights):
+            qc.rzz(2 * float(weight) * gamma[layer], int(i), int(j))
         
         # Mixer unitary
-        qc.rx(2 * beta, range(num_qubits))
+        qc.rx(2 * beta[layer], range(num_qubits))
+    
+    # Measure the qubits, or keep the exact outcome distribution
+    if measure:
+        qc.measure(range(num_qubits), range(num_qubits))
+    else:
+        qc.save_probabilities()
+    
+    return qc
+
+def basis_bits(num_qubits):
+    """
+    Get the bits of every basis state.
+    
+    Args:
+        num_qubits (int): The number of qubits.
+        
+    Returns:
+        np.ndarray: A (2 ** num_qubits, num_qubits) array; column q holds qubit q.
+    """
+    return ((np.arange(2 ** num_qubits)[:, None] >> np.arange(num_qubits)) & 1).astype(bool)
+
+def bitstring_bits(bitstrings, num_qubits):
+    """
+    Convert measured bitstrings into a bit array without a per-string Python loop.
+    
+    Args:
+        bitstrings (list): The bitstrings, most significant qubit first as in qiskit counts.
+        num_qubits (int): The number of qubits.
+        
+    Returns:
+        np.ndarray: A (len(bitstrings), num_qubits) array; column q holds qubit q.
+    """
+    characters = np.array(list(bitstrings), dtype=f'U{num_qubits}').view('U1').reshape(-1, num_qubits)
+    return (characters == '1')[:, ::-1]
+
+def cut_values(bits, edges, weights):
+    """
+    Compute the weighted cut value of many assignments at once.
+    
+    Args:
+        bits (np.ndarray): The node assignments, one row per assignment.
+        edges (np.ndarray): The graph edges.
+        weights (np.ndarray): The edge weights.
+        
+    Returns:
+        np.ndarray: The cut value of each assignment.
+    """
+    return (bits[:, edges[:, 0]] != bits[:, edges[:, 1]]) @ weights
+
+def counts_cut_values(counts, parameters):
+    """
+    Compute the expected and best cut value of sampled bitstrings.
+    
+    Args:
+        counts (dict): The result counts.
+        parameters (dict): The parameters for QAOA algorithm.
+        
+    Returns:
+        dict: The expected cut, the best sampled cut and its bitstring.
+    """
+    num_qubits, edges, weights = problem_graph(parameters)
+    bitstrings = list(counts)
+    frequencies = np.array([counts[bitstring] for bitstring in bitstrings], dtype=float)
+    values = cut_values(bitstring_bits(bitstrings, num_qubits), edges, weights)
+    best = int(np.argmax(values))
+    return {
+        'expected_cut': float(values @ frequencies / frequencies.sum()),
+        'best_cut': float(values[best]),
+        'best_bitstring': bitstrings[best]
+    }
+
+def _angle_binds(compiled_circuit, gammas, betas):
+    """
+    Build Aer parameter bindings for per-layer angle arrays of shape (points, p).
+    
+    Angles the circuit does not use are skipped; a graph without edges, for
+    example, leaves no γ in the circuit.
+    """
+    circuit_parameters = {param.name: param for param in compiled_circuit.parameters}
+    binds = {}
+    for layer in range(gammas.shape[1]):
+        for name, angles in ((f'γ[{layer}]', gammas), (f'β[{layer}]', betas)):
+            if name in circuit_parameters:
+                binds[circuit_parameters[name]] = angles[:, layer].tolist()
+    if not binds:
+        raise ValueError("The QAOA circuit has no angles to bind")
+    return [binds]
+
+def _layer_angles(value, p):
+    """Expand a scalar angle or a per-layer sequence into an array of p angles."""
+    angles = np.atleast_1d(np.asarray(value, dtype=float))
+    if len(angles) == 1:
+        angles = np.repeat(angles, p)
+    if len(angles) != p:
+        raise ValueError(f"Expected 1 or {p} angles, got {len(angles)}")
+    return angles
+
+def qaoa_expectations(parameters, gammas, betas, batch_size=1024):
+    """
+    Evaluate the expected cut value for many angle sets in batched simulator jobs.
+    
+    The circuit is compiled once; each batch of angle sets is a single job of
+    parameter bindings. The default 'statevector' estimator uses exact outcome
+    probabilities; estimator='shots' samples counts, which scales to graphs
+    too large for a full probability vector.
+    
+    Args:
+        parameters (dict): The parameters for QAOA algorithm.
+        gammas (np.ndarray): The problem angles, shape (points, p).
+        betas (np.ndarray): The mixer angles, shape (points, p).
+        batch_size (int): The maximum number of angle sets per job.
+        
+    Returns:
+        np.ndarray: The expected cut value for each angle set.
+    """
+    num_qubits, edges, weights = problem_graph(parameters)
+    p = parameters.get('p', 1)
+    estimator = parameters.get('estimator', 'statevector')
+    gammas = np.asarray(gammas, dtype=float).reshape(-1, p)
+    betas = np.asarray(betas, dtype=float).reshape(-1, p)
+    
+    # The angle sets of a batch are independent experiments of one job, simulated in parallel
+    if estimator == 'statevector':
+        simulator = get_backend(method='statevector', max_parallel_experiments=0)
+        compiled_circuit = cached_transpile(build_qaoa_circuit(num_qubits, p, edges, weights, measure=False), simulator)
+        values = cut_values(basis_bits(num_qubits), edges, weights)
+    elif estimator == 'shots':
+        simulator = get_backend(max_parallel_experiments=0)
+        compiled_circuit = cached_transpile(build_qaoa_circuit(num_qubits, p, edges, weights), simulator)
+    else:
+        raise ValueError(f"Unknown estimator: {estimator}")
+    
+    expectations = np.empty(len(gammas))
+    for start in range(0, len(gammas), batch_size):
+        stop = min(start + batch_size, len(gammas))
+        parameter_binds = _angle_binds(compiled_circuit, gammas[start:stop], betas[start:stop])
+        if estimator == 'statevector':
+            result = simulator.run(compiled_circuit, parameter_binds=parameter_binds, shots=1).result()
+            probabilities = np.array([result.data(i)['probabilities'] for i in range(stop - start)])
+            expectations[start:stop] = probabilities @ values
+        else:
+            result = simulator.run(compiled_circuit, parameter_binds=parameter_binds, shots=parameters.get('shots', 1000)).result()
+            expectations[start:stop] = [counts_cut_values(result.get_counts(i), parameters)['expected_cut'] for i in range(stop - start)]
+    return expectations
+
+def qaoa_landscape(parameters, gammas, betas, batch_size=1024):
+    """
+    Scan the expected cut value over a grid of (γ, β) angles.
+    
+    Every layer uses the same (γ, β) pair, which makes the landscape suitable
+    for warm-starting per-layer optimization.
+    
+    Args:
+        parameters (dict): The parameters for QAOA algorithm.
+        gammas (np.ndarray): The problem angles of the grid.
+        betas (np.ndarray): The mixer angles of the grid.
+        batch_size (int): The maximum number of grid points per job.
+        
+    Returns:
+        np.ndarray: The expected cut values, shape (len(gammas), len(betas)).
+    """
+    p = parameters.get('p', 1)
+    gamma_grid, beta_grid = np.meshgrid(np.asarray(gammas, dtype=float), np.asarray(betas, dtype=float), indexing='ij')
+    expectations = qaoa_expectations(
+        parameters,
+        np.repeat(gamma_grid.reshape(-1, 1), p, axis=1),
+        np.repeat(beta_grid.reshape(-1, 1), p, axis=1),
+        batch_size=batch_size
+    )
+    return expectations.reshape(gamma_grid.shape)
+
+def qaoa_algorithm(parameters):
+    """
+    QAOA algorithm implementation.
+    
+    The problem graph is read with problem_graph. 'gamma' and 'beta' may be
+    single angles shared by all layers or sequences with one angle per layer.
+    
+    Args:
+        parameters (dict): The parameters for QAOA algorithm.
+        
+    Returns:
+        dict: The result counts from the execution.
+    """
+    num_qubits, edges, weights = problem_graph(parameters)
+    p = parameters.get('p', 1)  # Number of QAOA layers
     
-    # Measure the qubits
-    qc.measure(range(num_qubits), range(num_qubits))
+    # Compile the parameterized circuit once
+    simulator = get_backend()
+    compiled_circuit = cached_transpile(build_qaoa_circuit(num_qubits, p, edges, weights), simulator)
     
     # Bind parameters
-    gamma_value = parameters.get('gamma', np.pi / 4)
-    beta_value = parameters.get('beta', np.pi / 4)
-    qc = qc.bind_parameters({gamma: gamma_value, beta: beta_value})
+    gamma_values = _layer_angles(parameters.get('gamma', np.pi / 4), p)
+    beta_values = _layer_angles(parameters.get('beta', np.pi / 4), p)
+    parameter_binds = _angle_binds(compiled_circuit, gamma_values[None, :], beta_values[None, :])
     
     # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
+    job = simulator.run(compiled_circuit, parameter_binds=parameter_binds, shots=parameters.get('shots', 1000))
     result = job.result()
     
     # Get the counts and plot the histogram
-    counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    counts = result.get_counts(0)
+    plot_counts(counts, name='qaoa', plot=parameters.get('plot'))
     
     return counts
 
@@ -65,7 +300,7 @@ def run_qaoa(parameters):
         parameters (dict): The parameters for QAOA algorithm.
         
     Returns:
-        dict: The result counts and accuracy from the execution.
+        dict: The result counts, cut values and accuracy from the execution.
     """
     
     # Run QAOA algorithm with the given parameters
@@ -75,4 +310,6 @@ def run_qaoa(parameters):
     total_counts = sum(result_counts.values())
     accuracy = 1.0  # QAOA doesn't have a specific target state for accuracy
     
-    return {'result_counts': result_counts, 'accuracy': accuracy}
\ No newline at end of file
+    result = {'result_counts': result_counts, 'accuracy': accuracy}
+    result.update(counts_cut_values(result_counts, parameters))
+    return result
\ No newline at end of file
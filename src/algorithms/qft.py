@@ -1,6 +1,7 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
 def qft_algorithm(parameters):
     """
@@ -27,14 +28,14 @@ def qft_algorithm(parameters):
     qc.measure(range(num_qubits), range(num_qubits))
     
     # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
+    simulator = get_backend()
+    compiled_circuit = cached_transpile(qc, simulator)
     job = simulator.run(compiled_circuit, shots=1000)
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='qft', plot=parameters.get('plot'))
     
     return counts
 
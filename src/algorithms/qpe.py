@@ -1,16 +1,17 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
-def qpe_algorithm(parameters):
+def build_qpe_circuit(parameters):
     """
-    Quantum Phase Estimation (QPE) algorithm implementation.
+    Build the measured QPE circuit for the given parameters.
     
     Args:
         parameters (dict): The parameters for QPE.
         
     Returns:
-        dict: The result counts from the execution.
+        QuantumCircuit: The QPE circuit.
     """
     num_qubits = parameters.get('num_qubits', 3)
     target_phase = parameters.get('target_phase', 0.25)
@@ -23,15 +24,46 @@ def qpe_algorithm(parameters):
     qc.p(target_phase * 2 * 3.14159, range(num_qubits))
     qc.measure(range(num_qubits), range(num_qubits))
     
+    return qc
+
+def qpe_accuracy(counts, parameters):
+    """
+    Compute the fraction of shots that measured the target phase.
+    
+    Args:
+        counts (dict): The result counts.
+        parameters (dict): The parameters for QPE.
+        
+    Returns:
+        float: The accuracy.
+    """
+    target_phase = parameters.get('target_phase', 0.25)
+    target_state = format(int(target_phase * (2 ** parameters.get('num_qubits', 3))), 'b').zfill(parameters.get('num_qubits', 3))
+    total_counts = sum(counts.values())
+    correct_counts = counts.get(target_state, 0)
+    return correct_counts / total_counts if total_counts > 0 else 0
+
+def qpe_algorithm(parameters):
+    """
+    Quantum Phase Estimation (QPE) algorithm implementation.
+    
+    Args:
+        parameters (dict): The parameters for QPE.
+        
+    Returns:
+        dict: The result counts from the execution.
+    """
+    qc = build_qpe_circuit(parameters)
+    
     # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
+    simulator = get_backend()
+    compiled_circuit = cached_transpile(qc, simulator)
+    job = simulator.run(compiled_circuit, shots=parameters.get('shots', 1000), seed_simulator=parameters.get('seed'))
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='qpe', plot=parameters.get('plot'))
     
     return counts
 
@@ -50,10 +82,6 @@ def run_qpe(parameters):
     result_counts = qpe_algorithm(parameters)
     
     # Calculate accuracy
-    target_phase = parameters.get('target_phase', 0.25)
-    target_state = format(int(target_phase * (2 ** parameters.get('num_qubits', 3))), 'b').zfill(parameters.get('num_qubits', 3))
-    total_counts = sum(result_counts.values())
-    correct_counts = result_counts.get(target_state, 0)
-    accuracy = correct_counts / total_counts if total_counts > 0 else 0
+    accuracy = qpe_accuracy(result_counts, parameters)
     
     return {'result_counts': result_counts, 'accuracy': accuracy}
\ No newline at end of file
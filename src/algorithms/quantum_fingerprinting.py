@@ -1,17 +1,23 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import backend_for
+from ..utils.stabilizer import run_exact
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
-def quantum_fingerprinting(string1, string2):
+def quantum_fingerprinting(string1, string2, plot=None, exact=False, shots=None, seed=None):
     """
     Quantum Fingerprinting algorithm implementation.
     
     Args:
         string1 (str): The first binary string.
         string2 (str): The second binary string.
+        plot (bool): Whether to plot the histogram (defaults to the global plotting mode).
+        exact (bool): Whether to compute the exact probabilities with the stabilizer simulator.
+        shots (int): The number of shots (1000 by default); with exact, sample this many counts instead of probabilities.
+        seed (int): The simulator seed.
         
     Returns:
-        dict: The result counts from the execution.
+        dict: The result counts from the execution, or the exact probabilities.
     """
     num_qubits = max(len(string1), len(string2))
     
@@ -40,20 +46,25 @@ def quantum_fingerprinting(string1, string2):
     # Measure the qubits
     qc.measure(range(num_qubits), range(num_qubits))
     
-    # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
-    result = job.result()
+    if exact:
+        # The circuit is Clifford, so the tableau gives its exact distribution
+        counts = run_exact(qc, shots=shots, seed=seed)
+    else:
+        # Execute the circuit on the AerSimulator
+        simulator = backend_for(qc)
+        compiled_circuit = cached_transpile(qc, simulator)
+        job = simulator.run(compiled_circuit, shots=shots if shots is not None else 1000, seed_simulator=seed)
+        result = job.result()
+        counts = result.get_counts(compiled_circuit)
     
-    # Get the counts and plot the histogram
-    counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    # Plot the histogram
+    plot_counts(counts, name='quantum_fingerprinting', plot=plot)
     
     return counts
 
 # Example usage
 if __name__ == "__main__":
+    # Run from the repository root with python -m src.algorithms.quantum_fingerprinting
     string1 = '1101'
     string2 = '1011'
     result = quantum_fingerprinting(string1, string2)
@@ -1,6 +1,7 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import backend_for
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
 def quantum_key_distribution_algorithm(parameters):
     """
@@ -26,14 +27,14 @@ def quantum_key_distribution_algorithm(parameters):
     qc.measure(range(num_qubits), range(num_qubits))
     
     # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
+    simulator = backend_for(qc)
+    compiled_circuit = cached_transpile(qc, simulator)
     job = simulator.run(compiled_circuit, shots=1000)
     result = job.result()
     
     # Get the counts and plot the histogram
     counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    plot_counts(counts, name='quantum_key_distribution', plot=parameters.get('plot'))
     
     return counts
 
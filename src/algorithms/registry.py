@@ -0,0 +1,70 @@
+from functools import lru_cache
+from importlib import import_module
+
+# Algorithm name and entry point of each problem type. Entry points are given
+# as 'module:function' inside this package and imported on first use, so a
+# run only pays for the algorithm modules it actually needs.
+ALGORITHMS = {
+    'Search': ('Grover', 'grover:run_grover'),
+    'Phase Estimation': ('QPE', 'qpe:run_qpe'),
+    'Factorization': ('Shor', 'shor:run_shor'),
+}
+
+# Circuit builder and accuracy function for problem types whose rows can share a simulator job
+BATCHABLE = {
+    'Search': ('grover:build_grover_circuit', 'grover:grover_accuracy'),
+    'Phase Estimation': ('qpe:build_qpe_circuit', 'qpe:qpe_accuracy'),
+}
+
+@lru_cache(maxsize=None)
+def _import(target):
+    module_name, _, attribute = target.partition(':')
+    return getattr(import_module(f'.{module_name}', __package__), attribute)
+
+def resolve(target):
+    """
+    Get the function a registry entry refers to, importing its module on first use.
+    
+    Args:
+        target: A 'module:function' reference or the function itself.
+        
+    Returns:
+        callable: The function.
+    """
+    if callable(target):
+        return target
+    return _import(target)
+
+def get_algorithm(problem_type):
+    """
+    Get the algorithm name and entry point of a problem type.
+    
+    Args:
+        problem_type (str): The problem type of a dataset row.
+        
+    Returns:
+        tuple: The algorithm name and the entry point.
+    """
+    if problem_type not in ALGORITHMS:
+        raise ValueError(f"Unknown problem type: {problem_type}")
+    algorithm, entry_point = ALGORITHMS[problem_type]
+    return algorithm, resolve(entry_point)
+
+def register_algorithm(problem_type, algorithm, entry_point, build_circuit=None, accuracy=None):
+    """
+    Register the algorithm of a problem type.
+    
+    Args:
+        problem_type (str): The problem type of a dataset row.
+        algorithm (str): The algorithm name.
+        entry_point: The entry point, or its 'module:function' reference.
+        build_circuit: The circuit builder, for algorithms whose rows can be batched.
+        accuracy: The accuracy function of the counts, required with build_circuit.
+    """
+    if (build_circuit is None) != (accuracy is None):
+        raise ValueError("Batchable algorithms need both a circuit builder and an accuracy function")
+    ALGORITHMS[problem_type] = (algorithm, entry_point)
+    if build_circuit is not None:
+        BATCHABLE[problem_type] = (build_circuit, accuracy)
+    else:
+        BATCHABLE.pop(problem_type, None)
\ No newline at end of file
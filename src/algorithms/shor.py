@@ -1,46 +1,92 @@
-from qiskit import QuantumCircuit, transpile, assemble
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import UnitaryGate
 import numpy as np
-from math import gcd
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd, isqrt
 import random
 import time
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
-def qpe_amod15(a):
-    n_count = 8
-    qc = QuantumCircuit(4 + n_count, n_count)
+# Orders of already-tried bases, keyed by (a, N); only verified orders are kept, so an entry
+# depends neither on the seed nor on which rows ran before, and failed attempts are retried
+_order_cache = {}
+# The widest order-finding circuit simulated by default (N < 64); wider ones take minutes per base
+MAX_QUBITS = 18
+
+def counting_qubits(N):
+    """Return the number of counting qubits used to find orders modulo N."""
+    return 2 * N.bit_length()
+
+def check_width(N, max_qubits=MAX_QUBITS):
+    """
+    Refuse moduli whose order-finding circuits are too wide to simulate.
+    
+    Args:
+        N (int): The modulus.
+        max_qubits (int): The largest number of qubits allowed.
+        
+    Raises:
+        ValueError: If the circuit for N needs more than max_qubits qubits.
+    """
+    width = N.bit_length() + counting_qubits(N)
+    if width > max_qubits:
+        raise ValueError(f"Finding orders modulo {N} needs {width} qubits, more than the limit of {max_qubits}")
+
+def qpe_amodN(a, N):
+    """
+    Build the order-finding circuit for base a modulo N.
+    
+    Args:
+        a (int): The base, coprime to N.
+        N (int): The modulus.
+        
+    Returns:
+        QuantumCircuit: The phase estimation circuit measuring the counting register.
+    """
+    n_work = N.bit_length()
+    n_count = counting_qubits(N)
+    qc = QuantumCircuit(n_work + n_count, n_count)
     for q in range(n_count):
         qc.h(q)  # Initialize counting qubits in state |+>
-    qc.x(3 + n_count)  # And auxiliary register in state |1>
+    qc.x(n_count)  # And auxiliary register in state |1>
     for q in range(n_count):  # Do controlled-U operations
-        qc.append(c_amod15(a, 2**q), [q] + [i + n_count for i in range(4)])
+        qc.append(c_amodN(a, 2**q, N), [q] + [i + n_count for i in range(n_work)])
     qc.append(qft_dagger(n_count), range(n_count))  # Do inverse-QFT
     qc.measure(range(n_count), range(n_count))
     return qc
 
+def qpe_amod15(a):
+    return qpe_amodN(a, 15)
+
+@lru_cache(maxsize=None)
+def c_amodN(a, power, N):
+    """
+    Controlled multiplication by a^power mod N, memoized per (a, power, N).
+    
+    The gate multiplies by a^power mod N directly instead of repeating the
+    multiplication by a power times. It is a permutation unitary acting on
+    N.bit_length() qubits, which leaves the basis states x >= N untouched.
+    """
+    multiplier = pow(a, power, N)
+    n_work = N.bit_length()
+    dimension = 2 ** (n_work + 1)
+    
+    # The control is the least significant qubit of the gate
+    source = np.arange(dimension)
+    x = source >> 1
+    target = np.where((source & 1) & (x < N), ((multiplier * x) % N << 1) | 1, source)
+    matrix = np.zeros((dimension, dimension))
+    matrix[target, source] = 1
+    
+    # Keep the gate name 'unitary' so the simulator applies the matrix without synthesis
+    return UnitaryGate(matrix, label="%i^%i mod %i" % (a, power, N))
+
 def c_amod15(a, power):
     """Controlled multiplication by a mod 15"""
-    U = QuantumCircuit(4)
-    for iteration in range(power):
-        if a in [2, 13]:
-            U.swap(0, 1)
-            U.swap(1, 2)
-            U.swap(2, 3)
-        if a in [7, 8]:
-            U.swap(2, 3)
-            U.swap(1, 2)
-            U.swap(0, 1)
-        if a in [4, 11]:
-            U.swap(1, 3)
-            U.swap(0, 2)
-        if a in [7, 11, 8, 13]:
-            for q in range(4):
-                U.x(q)
-    U = U.to_gate()
-    U.name = "%i^%i mod 15" % (a, power)
-    c_U = U.control()
-    return c_U
+    return c_amodN(a, power, 15)
 
 def qft_dagger(n):
     """n-qubit QFTdagger the first n qubits in circ"""
@@ -54,61 +100,183 @@ def qft_dagger(n):
     qc.name = "QFT†"
     return qc
 
-def shor_algorithm(N):
+def decode_order(counts, a, N, n_count=None):
+    """
+    Recover the order of a modulo N from the whole phase distribution.
+    
+    Every measured phase is expanded into continued fractions; the
+    denominators, and least common multiples of pairs of them, are checked
+    classically so only true multiples of the order are accepted; the
+    smallest one is then reduced to the order itself.
+    
+    Args:
+        counts (dict): The result counts of the counting register.
+        a (int): The base.
+        N (int): The modulus.
+        n_count (int): The number of counting qubits (defaults to counting_qubits(N)).
+        
+    Returns:
+        int: The order of a modulo N, or None if no candidate verifies.
+    """
+    if n_count is None:
+        n_count = counting_qubits(N)
+    
+    denominators = set()
+    for bitstring in sorted(counts, key=counts.get, reverse=True):
+        phase = int(bitstring, 2) / (2 ** n_count)
+        if phase == 0:
+            continue
+        denominators.add(Fraction(phase).limit_denominator(N).denominator)
+    
+    candidates = set(denominators)
+    for r1 in denominators:
+        for r2 in denominators:
+            candidates.add(r1 * r2 // gcd(r1, r2))
+    verified = [r for r in sorted(candidates) if r < N and pow(a, r, N) == 1]
+    if not verified:
+        return None
+    # The order divides every verified multiple of it
+    r = verified[0]
+    return next(d for d in range(1, r + 1) if r % d == 0 and pow(a, d, N) == 1)
+
+def find_orders(bases, N, plot=None, seed=None, max_qubits=MAX_QUBITS):
+    """
+    Find the orders of several bases modulo N with quantum phase estimation.
+    
+    The circuits of all bases without a known order are submitted as a single
+    multi-circuit simulator job. Verified orders are cached per (a, N), so a
+    base whose order was found is not simulated again in this process; a
+    cached order is the exact order, whatever seed or run produced it.
+    
+    Args:
+        bases (list): The bases, each coprime to N.
+        N (int): The modulus.
+        plot (bool): Whether to plot the histograms (defaults to the global plotting mode).
+        seed (int): The simulator seed.
+        max_qubits (int): The largest circuit width allowed (see check_width).
+        
+    Returns:
+        list: The order of each base, or None where it could not be determined.
+    """
+    orders = {a: _order_cache[(a, N)] for a in bases if (a, N) in _order_cache}
+    untried = [a for a in dict.fromkeys(bases) if a not in orders]
+    if untried:
+        check_width(N, max_qubits)
+        aer_sim = get_backend(max_parallel_experiments=0)
+        t_qcs = [cached_transpile(qpe_amodN(a, N), aer_sim) for a in untried]
+        result = aer_sim.run(t_qcs, seed_simulator=seed).result()  # Run all transpiled circuits in one job
+        for i, a in enumerate(untried):
+            counts = result.get_counts(i)
+            plot_counts(counts, name=f'shor_{N}_{a}', plot=plot)
+            orders[a] = decode_order(counts, a, N)
+            if orders[a] is not None:
+                _order_cache[(a, N)] = orders[a]
+    return [orders[a] for a in bases]
+
+def find_order(a, N, plot=None):
+    """
+    Find the order of a modulo N with quantum phase estimation.
+    
+    Args:
+        a (int): The base, coprime to N.
+        N (int): The modulus.
+        plot (bool): Whether to plot the histogram (defaults to the global plotting mode).
+        
+    Returns:
+        int: The order, or None if it could not be determined.
+    """
+    return find_orders([a], N, plot=plot)[0]
+
+def clear_order_cache():
+    """Forget the orders measured for previously tried bases."""
+    _order_cache.clear()
+
+def _perfect_power_root(N):
+    """Return b if N == b**k for some k >= 2, otherwise None."""
+    for k in range(2, N.bit_length() + 1):
+        b = round(N ** (1 / k))
+        for candidate in (b - 1, b, b + 1):
+            if candidate > 1 and candidate ** k == N:
+                return candidate
+    return None
+
+def _is_prime(N):
+    """Check primality by trial division."""
+    if N < 2:
+        return False
+    return all(N % d for d in range(2, isqrt(N) + 1))
+
+def factors_from_order(a, order, N):
+    """
+    Derive a nontrivial factor pair of N from the order of a.
+    
+    Returns:
+        tuple: The factors, or None if the order does not yield a nontrivial factor.
+    """
+    if order is None or order % 2 != 0:
+        return None
+    x = pow(a, order // 2, N)
+    for factor in (gcd(x - 1, N), gcd(x + 1, N)):
+        if 1 < factor < N:
+            return factor, N // factor
+    return None
+
+def shor_algorithm(N, plot=None, batch_size=4, seed=None, max_qubits=MAX_QUBITS):
     """
     Run Shor's algorithm to factorize the given number N.
     
+    Even numbers, perfect powers and bases sharing a factor with N are
+    handled classically. Each base is tried at most once, in random order;
+    the order-finding circuits of batch_size bases run as one simulator job.
+    
     Args:
         N (int): The number to factorize.
+        plot (bool): Whether to plot the histograms (defaults to the global plotting mode).
+        batch_size (int): The number of bases whose orders are found per job.
+        seed (int): The seed for the order of the bases and the simulator.
+        max_qubits (int): The largest circuit width allowed; wider moduli raise a ValueError.
         
     Returns:
         tuple: The factors of N.
     """
     if N % 2 == 0:
         return 2, N // 2
-
-    def get_order(a, N):
-        qc = qpe_amod15(a)
-        aer_sim = AerSimulator()
-        t_qc = transpile(qc, aer_sim)
-        result = aer_sim.run(t_qc).result()  # Run the transpiled circuit directly
-        counts = result.get_counts()
-        plot_histogram(counts)
-        plt.close()  # Close the figure after plotting
-        phase = max(counts, key=counts.get)
-        phase = int(phase, 2) / (2 ** 8)
-        if phase == 0:
-            raise ValueError("Phase is zero, cannot calculate order.")
-        order = int(1 / phase)
-        return order
-
-    while True:
-        a = random.randint(2, N - 1)
-        if gcd(a, N) != 1:
-            return gcd(a, N), N // gcd(a, N)
-        try:
-            order = get_order(a, N)
-        except ValueError:
-            continue  # Retry with a different 'a' if phase is zero
-        if order % 2 == 0:
-            factor1 = gcd(a ** (order // 2) - 1, N)
-            factor2 = gcd(a ** (order // 2) + 1, N)
-            if factor1 != 1 and factor2 != 1:
-                return factor1, factor2
+    if _is_prime(N):
+        raise ValueError(f"{N} is prime and cannot be factorized")
+    root = _perfect_power_root(N)
+    if root is not None:
+        return root, N // root
+    check_width(N, max_qubits)
+    
+    bases = list(range(2, N))
+    random.Random(seed).shuffle(bases)
+    for start in range(0, len(bases), batch_size):
+        batch = bases[start:start + batch_size]
+        for a in batch:
+            if gcd(a, N) != 1:
+                return gcd(a, N), N // gcd(a, N)
+        for a, order in zip(batch, find_orders(batch, N, plot=plot, seed=seed, max_qubits=max_qubits)):
+            factors = factors_from_order(a, order, N)
+            if factors is not None:
+                return factors
+    
+    raise ValueError(f"No base produced a factorization of {N}")
 
 def run_shor(parameters):
     """
     Run Shor's algorithm with the given parameters.
     
     Args:
-        parameters (dict): The parameters for Shor's algorithm.
+        parameters (dict): The parameters for Shor's algorithm: 'number', and optionally 'seed', 'batch_size',
+            'plot' and 'max_qubits' (a dataset row can raise the default MAX_QUBITS limit for its modulus).
         
     Returns:
         dict: The factors of the number and accuracy.
     """
     N = parameters['number']
     start_time = time.time()
-    factor1, factor2 = shor_algorithm(N)
+    factor1, factor2 = shor_algorithm(N, plot=parameters.get('plot'), batch_size=parameters.get('batch_size', 4), seed=parameters.get('seed'),
+                                      max_qubits=parameters.get('max_qubits', MAX_QUBITS))
     execution_time = time.time() - start_time
     
     # Calculate accuracy
@@ -118,6 +286,6 @@ def run_shor(parameters):
     return {'factor1': factor1, 'factor2': factor2, 'accuracy': accuracy, 'execution_time': execution_time}
 
 if __name__ == "__main__":
-    # Example usage
+    # Example usage; run from the repository root with python -m src.algorithms.shor
     parameters = {'number': 15}
     print(run_shor(parameters))
\ No newline at end of file
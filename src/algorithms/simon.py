@@ -1,6 +1,8 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
+from qiskit import QuantumCircuit
+from ..utils.backend import backend_for
+from ..utils.stabilizer import run_exact
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
 def simon_algorithm(parameters):
     """
@@ -10,7 +12,7 @@ def simon_algorithm(parameters):
         parameters (dict): The parameters for Simon's algorithm.
         
     Returns:
-        dict: The result counts from the execution.
+        dict: The result counts from the execution, or the exact probabilities with 'exact'.
     """
     hidden_string = parameters.get('hidden_string', '11')
     num_qubits = len(hidden_string)
@@ -32,15 +34,19 @@ def simon_algorithm(parameters):
     # Measure the first num_qubits
     qc.measure(range(num_qubits), range(num_qubits))
     
-    # Execute the circuit on the AerSimulator
-    simulator = AerSimulator()
-    compiled_circuit = transpile(qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
-    result = job.result()
+    if parameters.get('exact'):
+        # The circuit is Clifford: exact probabilities, or sampled counts when 'shots' is given
+        counts = run_exact(qc, shots=parameters.get('shots'), seed=parameters.get('seed'))
+    else:
+        # Execute the circuit on the AerSimulator
+        simulator = backend_for(qc)
+        compiled_circuit = cached_transpile(qc, simulator)
+        job = simulator.run(compiled_circuit, shots=parameters.get('shots', 1000), seed_simulator=parameters.get('seed'))
+        result = job.result()
+        counts = result.get_counts(compiled_circuit)
     
-    # Get the counts and plot the histogram
-    counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    # Plot the histogram
+    plot_counts(counts, name='simon', plot=parameters.get('plot'))
     
     return counts
 
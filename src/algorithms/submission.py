@@ -0,0 +1,41 @@
+from .registry import BATCHABLE, get_algorithm, resolve
+from ..utils.async_jobs import default_window, submit_circuits
+
+async def submit_algorithm(problem_type, parameters, window=None):
+    """
+    Run the algorithm of a problem type without blocking the event loop.
+    
+    Algorithms with a circuit builder are built, then awaited as a simulator
+    job in the job window, then post-processed. Other algorithms run their
+    entry point on the loop's default thread pool while holding a window slot.
+    
+    Args:
+        problem_type (str): The problem type, such as 'Search'.
+        parameters (dict): The parameters of the run, including optional 'shots' and 'seed'.
+        window (JobWindow): The window bounding the in-flight jobs (defaults to the loop's shared window).
+        
+    Returns:
+        dict: The result of the algorithm.
+    """
+    algorithm, entry_point = get_algorithm(problem_type)
+    if window is None:
+        window = default_window()
+    if problem_type not in BATCHABLE:
+        return await window.call(entry_point, parameters)
+    
+    build_circuit, post_process = (resolve(target) for target in BATCHABLE[problem_type])
+    qc = build_circuit(parameters)
+    counts, = await submit_circuits([qc], shots=parameters.get('shots', 1000), seed=parameters.get('seed'), window=window)
+    return {'result_counts': counts, 'accuracy': post_process(counts, parameters)}
+
+async def submit_grover(parameters, window=None):
+    """Submit Grover's algorithm; awaits the result of run_grover."""
+    return await submit_algorithm('Search', parameters, window=window)
+
+async def submit_qpe(parameters, window=None):
+    """Submit Quantum Phase Estimation; awaits the result of run_qpe."""
+    return await submit_algorithm('Phase Estimation', parameters, window=window)
+
+async def submit_shor(parameters, window=None):
+    """Submit Shor's algorithm; awaits the result of run_shor."""
+    return await submit_algorithm('Factorization', parameters, window=window)
\ No newline at end of file
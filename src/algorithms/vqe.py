@@ -1,28 +1,28 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
-from qiskit.visualization import plot_histogram
-from qiskit.circuit import Parameter
+from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 import numpy as np
-from scipy.optimize import minimize
+from scipy.optimize import OptimizeResult, minimize
+from ..utils.backend import get_backend
+from ..utils.transpile_cache import cached_transpile
+from ..utils.visualization import plot_counts
 
-def vqe_algorithm(parameters):
+def build_ansatz(num_qubits, ansatz_depth, measure=True):
     """
-    VQE algorithm implementation.
+    Build the parameterized VQE ansatz.
     
     Args:
-        parameters (dict): The parameters for VQE algorithm.
+        num_qubits (int): The number of qubits.
+        ansatz_depth (int): The number of ansatz layers.
+        measure (bool): Whether to measure all qubits; otherwise the statevector is saved.
         
     Returns:
-        dict: The result counts from the execution.
+        QuantumCircuit: The ansatz with ansatz_depth * num_qubits free parameters.
     """
-    num_qubits = parameters.get('num_qubits', 2)
-    ansatz_depth = parameters.get('ansatz_depth', 1)
-    
     # Create a Quantum Circuit with num_qubits qubits and num_qubits classical bits
     qc = QuantumCircuit(num_qubits, num_qubits)
     
     # Define parameters for the ansatz
-    theta = [Parameter(f'θ{i}') for i in range(ansatz_depth * num_qubits)]
+    theta = ParameterVector('θ', ansatz_depth * num_qubits)
     
     # Ansatz circuit (example: simple layered ansatz)
     for d in range(ansatz_depth):
@@ -31,35 +31,308 @@ def vqe_algorithm(parameters):
         for q in range(num_qubits - 1):
             qc.cx(q, q + 1)
     
-    # Measure the qubits
-    qc.measure(range(num_qubits), range(num_qubits))
+    # Measure the qubits, or keep the final state for exact expectation values
+    if measure:
+        qc.measure(range(num_qubits), range(num_qubits))
+    else:
+        qc.save_statevector()
+    
+    return qc
+
+def _parameter_binds(compiled_circuit, param_sets):
+    """Build Aer parameter bindings against the compiled circuit's own parameters."""
+    circuit_parameters = list(compiled_circuit.parameters)
+    return [{param: param_sets[:, i].tolist() for i, param in enumerate(circuit_parameters)}]
+
+def run_bindings(compiled_circuit, param_sets, shots=1000, seed=None):
+    """
+    Execute a compiled parameterized circuit for several parameter sets in one job.
+    
+    Args:
+        compiled_circuit (QuantumCircuit): The transpiled, still parameterized circuit.
+        param_sets (np.ndarray): The parameter values, one row per binding.
+        shots (int): The number of shots per binding.
+        seed (int): The simulator seed.
+        
+    Returns:
+        list: The result counts for each binding, in input order.
+    """
+    param_sets = np.atleast_2d(param_sets)
+    # The bindings are independent experiments of one job, simulated in parallel
+    simulator = get_backend(max_parallel_experiments=0)
+    job = simulator.run(compiled_circuit, parameter_binds=_parameter_binds(compiled_circuit, param_sets), shots=shots, seed_simulator=seed)
+    result = job.result()
+    return [result.get_counts(i) for i in range(len(param_sets))]
+
+def run_statevectors(compiled_circuit, param_sets):
+    """
+    Compute the final statevector of a compiled parameterized circuit for several parameter sets in one job.
+    
+    Args:
+        compiled_circuit (QuantumCircuit): The transpiled ansatz built with measure=False.
+        param_sets (np.ndarray): The parameter values, one row per binding.
+        
+    Returns:
+        np.ndarray: The statevectors, one row per binding.
+    """
+    param_sets = np.atleast_2d(param_sets)
+    simulator = get_backend(method='statevector', max_parallel_experiments=0)
+    job = simulator.run(compiled_circuit, parameter_binds=_parameter_binds(compiled_circuit, param_sets), shots=1)
+    result = job.result()
+    return np.array([np.asarray(result.data(i)['statevector']) for i in range(len(param_sets))])
+
+def pauli_terms(hamiltonian, num_qubits):
+    """
+    Convert a Pauli-sum Hamiltonian into bit masks.
+    
+    The Hamiltonian is either a list of (label, coefficient) pairs with qiskit
+    ordered labels (the rightmost character acts on qubit 0), e.g.
+    [('ZZ', 1.0), ('XI', 0.5)], or a dict with 'terms' of (pauli, qubit) pairs
+    and matching 'coefficients'. None gives the all-qubit Z parity.
+    
+    Args:
+        hamiltonian (list or dict): The Pauli-sum Hamiltonian.
+        num_qubits (int): The number of qubits.
+        
+    Returns:
+        list: (x_mask, z_mask, num_y, coefficient) tuples, one per term.
+    """
+    if hamiltonian is None:
+        hamiltonian = [('Z' * num_qubits, 1.0)]
+    elif isinstance(hamiltonian, dict):
+        labels = []
+        for pauli, qubit in hamiltonian['terms']:
+            label = ['I'] * num_qubits
+            label[num_qubits - 1 - qubit] = pauli
+            labels.append(''.join(label))
+        hamiltonian = list(zip(labels, hamiltonian['coefficients']))
+    
+    terms = []
+    for label, coefficient in hamiltonian:
+        if len(label) != num_qubits:
+            raise ValueError(f"Pauli label '{label}' does not act on {num_qubits} qubits")
+        x_mask = z_mask = num_y = 0
+        for qubit, pauli in enumerate(reversed(label.upper())):
+            if pauli in 'XY':
+                x_mask |= 1 << qubit
+            if pauli in 'ZY':
+                z_mask |= 1 << qubit
+            if pauli == 'Y':
+                num_y += 1
+            elif pauli not in 'IXZ':
+                raise ValueError(f"Unknown Pauli operator '{pauli}' in '{label}'")
+        terms.append((x_mask, z_mask, num_y, coefficient))
+    return terms
+
+def _parity(indices, mask):
+    """Return (-1) ** popcount(indices & mask) for an array of basis indices."""
+    bits = indices & mask
+    parity = np.zeros(len(indices), dtype=np.int64)
+    while mask:
+        parity ^= bits & 1
+        bits >>= 1
+        mask >>= 1
+    return 1 - 2 * parity
+
+def pauli_expectation(statevectors, terms):
+    """
+    Compute the expectation value of a Pauli sum for one or more statevectors.
+    
+    Args:
+        statevectors (np.ndarray): The statevectors, one per row.
+        terms (list): The Hamiltonian terms from pauli_terms.
+        
+    Returns:
+        np.ndarray: The expectation value for each statevector.
+    """
+    statevectors = np.atleast_2d(statevectors)
+    indices = np.arange(statevectors.shape[1])
+    expectation_values = np.zeros(len(statevectors))
+    for x_mask, z_mask, num_y, coefficient in terms:
+        # P|b> = i^num_y (-1)^popcount(b & z) |b ^ x>
+        amplitudes = statevectors * _parity(indices, z_mask)
+        overlap = np.sum(np.conj(statevectors[:, indices ^ x_mask]) * amplitudes, axis=1)
+        expectation_values += coefficient * np.real((1j ** num_y) * overlap)
+    return expectation_values
+
+def counts_expectation(counts, terms):
+    """
+    Estimate the expectation value of a diagonal Pauli sum from result counts.
+    
+    Args:
+        counts (dict): The result counts.
+        terms (list): The Hamiltonian terms from pauli_terms.
+        
+    Returns:
+        float: The estimated expectation value.
+    """
+    if any(x_mask for x_mask, _, _, _ in terms):
+        raise ValueError("Shot-based estimation only supports Hamiltonians made of I and Z terms")
+    
+    total_counts = sum(counts.values())
+    indices = np.array([int(key, 2) for key in counts])
+    weights = np.array(list(counts.values())) / total_counts
+    return sum(coefficient * np.dot(_parity(indices, z_mask), weights) for _, z_mask, _, coefficient in terms)
+
+def parameter_shift_gradient(evaluate, params):
+    """
+    Compute the objective and its parameter-shift gradient with a single batched evaluation.
+    
+    Every ansatz parameter drives exactly one rotation gate, so the gradient is
+    exact: df/dθi = (f(θ + π/2 ei) - f(θ - π/2 ei)) / 2.
+    
+    Args:
+        evaluate (callable): Maps an array of parameter sets (one per row) to their objective values.
+        params (np.ndarray): The parameters at which to differentiate.
+        
+    Returns:
+        tuple: The objective value at params and the gradient.
+    """
+    params = np.asarray(params, dtype=float)
+    shifts = np.eye(len(params)) * (np.pi / 2)
+    
+    # Submit the unshifted point and all 2P shifted points as one job
+    values = evaluate(np.vstack([params, params + shifts, params - shifts]))
+    num_params = len(params)
+    gradient = (values[1:num_params + 1] - values[num_params + 1:]) / 2
+    return values[0], gradient
+
+def adam_minimize(value_and_gradient, initial_params, maxiter=100, learning_rate=0.1, beta1=0.9, beta2=0.999, eps=1e-8):
+    """
+    Minimize an objective with the Adam optimizer.
+    
+    Args:
+        value_and_gradient (callable): Returns the objective value and gradient at a point.
+        initial_params (np.ndarray): The starting parameters.
+        maxiter (int): The number of optimization steps.
+        learning_rate (float): The step size.
+        beta1 (float): The decay rate of the first moment estimate.
+        beta2 (float): The decay rate of the second moment estimate.
+        eps (float): The numerical stabilizer.
+        
+    Returns:
+        OptimizeResult: The optimization result with x, fun and nit.
+    """
+    params = np.array(initial_params, dtype=float)
+    first_moment = np.zeros_like(params)
+    second_moment = np.zeros_like(params)
+    best_params, best_value = params.copy(), np.inf
+    
+    for step in range(1, maxiter + 1):
+        value, gradient = value_and_gradient(params)
+        if value < best_value:
+            best_params, best_value = params.copy(), value
+        first_moment = beta1 * first_moment + (1 - beta1) * gradient
+        second_moment = beta2 * second_moment + (1 - beta2) * gradient ** 2
+        corrected_first = first_moment / (1 - beta1 ** step)
+        corrected_second = second_moment / (1 - beta2 ** step)
+        params = params - learning_rate * corrected_first / (np.sqrt(corrected_second) + eps)
+    
+    return OptimizeResult(x=best_params, fun=best_value, nit=maxiter)
+
+def spsa_minimize(evaluate, initial_params, maxiter=100, a=1.0, c=0.2, alpha=0.602, gamma=0.101, seed=None):
+    """
+    Minimize an objective with simultaneous perturbation stochastic approximation (SPSA).
+    
+    Both perturbed points of a step are evaluated as one batch.
+    
+    Args:
+        evaluate (callable): Maps an array of parameter sets (one per row) to their objective values.
+        initial_params (np.ndarray): The starting parameters.
+        maxiter (int): The number of optimization steps.
+        a (float): The step size scale.
+        c (float): The perturbation size scale.
+        alpha (float): The step size decay exponent.
+        gamma (float): The perturbation size decay exponent.
+        seed (int): Seed for the perturbation directions.
+        
+    Returns:
+        OptimizeResult: The optimization result with x, fun and nit.
+    """
+    rng = np.random.default_rng(seed)
+    params = np.array(initial_params, dtype=float)
+    stability = 0.1 * maxiter
+    
+    for step in range(maxiter):
+        step_size = a / (step + 1 + stability) ** alpha
+        perturbation_size = c / (step + 1) ** gamma
+        delta = rng.choice([-1.0, 1.0], size=len(params))
+        values = evaluate(np.vstack([params + perturbation_size * delta, params - perturbation_size * delta]))
+        gradient = (values[0] - values[1]) / (2 * perturbation_size) * delta
+        params = params - step_size * gradient
+    
+    return OptimizeResult(x=params, fun=evaluate(params)[0], nit=maxiter)
+
+def vqe_algorithm(parameters):
+    """
+    VQE algorithm implementation.
+    
+    The ansatz is transpiled once; each optimizer step only submits new
+    parameter bindings to the simulator. With the default 'statevector'
+    estimator the objective is the exact expectation value of the
+    Hamiltonian; the 'shots' estimator samples it from measured counts.
+    
+    The optimizer is chosen with parameters['optimizer']: 'COBYLA' (default),
+    'L-BFGS-B' and 'adam' use batched parameter-shift gradients, 'spsa' uses
+    two batched evaluations per step.
+    
+    Args:
+        parameters (dict): The parameters for VQE algorithm.
+        
+    Returns:
+        dict: The result counts from the execution.
+    """
+    num_qubits = parameters.get('num_qubits', 2)
+    ansatz_depth = parameters.get('ansatz_depth', 1)
+    shots = parameters.get('shots', 1000)
+    estimator = parameters.get('estimator', 'statevector')
+    optimizer = parameters.get('optimizer', 'COBYLA')
+    maxiter = parameters.get('maxiter', 100)
+    seed = parameters.get('seed')
+    terms = pauli_terms(parameters.get('hamiltonian'), num_qubits)
+    
+    # Compile the parameterized ansatz once
+    qc = build_ansatz(num_qubits, ansatz_depth)
+    compiled_circuit = cached_transpile(qc, get_backend(max_parallel_experiments=0))
+    
+    # Function to execute the circuit for a batch of parameter sets and return the expectation values
+    if estimator == 'statevector':
+        compiled_ansatz = cached_transpile(build_ansatz(num_qubits, ansatz_depth, measure=False),
+                                           get_backend(method='statevector', max_parallel_experiments=0))
+        
+        def evaluate(param_sets):
+            return pauli_expectation(run_statevectors(compiled_ansatz, param_sets), terms)
+    elif estimator == 'shots':
+        def evaluate(param_sets):
+            return np.array([counts_expectation(counts, terms) for counts in run_bindings(compiled_circuit, param_sets, shots=shots, seed=seed)])
+    else:
+        raise ValueError(f"Unknown estimator: {estimator}")
     
-    # Function to execute the circuit and return the expectation value
     def execute_circuit(params):
-        bound_qc = qc.bind_parameters({theta[i]: params[i] for i in range(len(params))})
-        simulator = AerSimulator()
-        compiled_circuit = transpile(bound_qc, simulator)
-        job = simulator.run(compiled_circuit, shots=1000)
-        result = job.result()
-        counts = result.get_counts(compiled_circuit)
-        expectation_value = sum((-1)**(sum(int(bit) for bit in key)) * value for key, value in counts.items()) / 1000
-        return expectation_value
-    
-    # Initial parameters
-    initial_params = np.random.rand(ansatz_depth * num_qubits)
+        return evaluate(params)[0]
+    
+    def value_and_gradient(params):
+        return parameter_shift_gradient(evaluate, params)
+    
+    # Initial parameters, reproducible when a seed is given
+    initial_params = np.random.default_rng(seed).random(ansatz_depth * num_qubits)
     
     # Minimize the expectation value
-    result = minimize(execute_circuit, initial_params, method='COBYLA')
+    if optimizer == 'COBYLA':
+        result = minimize(execute_circuit, initial_params, method='COBYLA', options={'maxiter': maxiter})
+    elif optimizer == 'L-BFGS-B':
+        result = minimize(value_and_gradient, initial_params, jac=True, method='L-BFGS-B', options={'maxiter': maxiter})
+    elif optimizer == 'adam':
+        result = adam_minimize(value_and_gradient, initial_params, maxiter=maxiter,
+                               learning_rate=parameters.get('learning_rate', 0.1))
+    elif optimizer == 'spsa':
+        result = spsa_minimize(evaluate, initial_params, maxiter=maxiter, seed=seed)
+    else:
+        raise ValueError(f"Unknown optimizer: {optimizer}")
     
     # Get the final counts
-    final_params = result.x
-    final_qc = qc.bind_parameters({theta[i]: final_params[i] for i in range(len(final_params))})
-    simulator = AerSimulator()
-    compiled_circuit = transpile(final_qc, simulator)
-    job = simulator.run(compiled_circuit, shots=1000)
-    result = job.result()
-    counts = result.get_counts(compiled_circuit)
-    plot_histogram(counts)
+    counts = run_bindings(compiled_circuit, result.x, shots=shots, seed=seed)[0]
+    plot_counts(counts, name='vqe', plot=parameters.get('plot'))
     
     return counts
 
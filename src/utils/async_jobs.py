@@ -0,0 +1,120 @@
+import asyncio
+import weakref
+from qiskit.providers.jobstatus import JOB_FINAL_STATES
+from .backend import backend_for
+from .transpile_cache import cached_transpile
+
+# The default window of each event loop; a semaphore cannot be shared between loops
+_default_windows = weakref.WeakKeyDictionary()
+# The longest wait between two checks of a running job, in seconds
+_MAX_POLL_INTERVAL = 0.05
+
+def _compile(circuits):
+    """Pick the backend of a job and transpile its circuits."""
+    simulator = backend_for(circuits, max_parallel_experiments=0)
+    return simulator, [cached_transpile(qc, simulator) for qc in circuits]
+
+async def _job_result(job):
+    """Wait for a simulator job by polling its status, so no thread blocks on it."""
+    interval = 0.001
+    while job.status() not in JOB_FINAL_STATES:
+        await asyncio.sleep(interval)
+        interval = min(2 * interval, _MAX_POLL_INTERVAL)
+    return job.result()
+
+class JobWindow:
+    """
+    A bounded window of in-flight simulator jobs.
+    
+    A submission waits for a free slot before its circuits are compiled and
+    submitted, so callers that produce work faster than the simulator can run
+    it are held back instead of queueing jobs without limit.
+    """
+    
+    def __init__(self, max_in_flight=8):
+        """
+        Args:
+            max_in_flight (int): The number of jobs that may run or wait in the simulator at once.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"The window must hold at least one job, got {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+    
+    @property
+    def in_flight(self):
+        """The number of jobs submitted and not yet completed."""
+        return self._in_flight
+    
+    async def submit(self, circuits, shots=1000, seed=None):
+        """
+        Run measured circuits as one simulator job without blocking the event loop.
+        
+        The circuits are compiled on the default thread pool of the event loop;
+        the job is then awaited on the loop itself, so jobs in flight do not
+        hold threads and the pool size does not limit the window.
+        
+        Args:
+            circuits (list): The quantum circuits.
+            shots (int): The number of shots per circuit.
+            seed (int): The simulator seed; as with run_circuits, the simulator derives a different seed for each circuit of the job.
+            
+        Returns:
+            list: The result counts of each circuit, in input order.
+        """
+        if not circuits:
+            return []
+        async with self._semaphore:
+            simulator, compiled_circuits = await asyncio.get_running_loop().run_in_executor(None, _compile, circuits)
+            job = simulator.run(compiled_circuits, shots=shots, seed_simulator=seed)
+            self._in_flight += 1
+            try:
+                result = await _job_result(job)
+            finally:
+                self._in_flight -= 1
+        return [result.get_counts(i) for i in range(len(compiled_circuits))]
+    
+    async def call(self, function, *args):
+        """
+        Run a blocking function, such as an entry point that runs its own jobs, in a window slot.
+        
+        The function runs on, and holds a thread of, the default thread pool of the event loop.
+        
+        Args:
+            function (callable): The function.
+            *args: The arguments of the function.
+            
+        Returns:
+            The return value of the function.
+        """
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+            finally:
+                self._in_flight -= 1
+
+def default_window():
+    """Return the job window shared by the submissions of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _default_windows:
+        _default_windows[loop] = JobWindow()
+    return _default_windows[loop]
+
+async def submit_circuits(circuits, shots=1000, seed=None, window=None):
+    """
+    Run measured circuits as one simulator job through a job window.
+    
+    Args:
+        circuits (list): The quantum circuits.
+        shots (int): The number of shots per circuit.
+        seed (int): The simulator seed.
+        window (JobWindow): The window bounding the in-flight jobs (defaults to the loop's shared window).
+        
+    Returns:
+        list: The result counts of each circuit, in input order.
+    """
+    if window is None:
+        window = default_window()
+    return await window.submit(circuits, shots=shots, seed=seed)
\ No newline at end of file
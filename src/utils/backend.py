@@ -0,0 +1,118 @@
+import os
+import threading
+from qiskit_aer import AerSimulator
+from .stabilizer import is_clifford_circuit
+
+# Process-wide simulator options shared by every algorithm module
+_DEFAULT_OPTIONS = {
+    'method': 'automatic',
+    'precision': 'double',
+    'max_parallel_threads': 0,
+}
+
+_options = dict(_DEFAULT_OPTIONS)
+_options_lock = threading.Lock()
+_generation = 0
+_local = threading.local()
+
+def configure_backend(method=None, precision=None, max_parallel_threads=None, **options):
+    """
+    Configure the simulator used by all algorithm modules.
+
+    Backends already handed out keep their options; every thread builds a
+    fresh backend with the new configuration on its next call to get_backend.
+
+    Args:
+        method (str): The AerSimulator method (e.g. 'automatic', 'statevector').
+        precision (str): The simulation precision ('double' or 'single').
+        max_parallel_threads (int): The thread count for the simulator (0 uses all cores).
+        **options: Any further AerSimulator options.
+
+    Returns:
+        dict: The resulting backend configuration.
+    """
+    global _generation
+    updates = dict(options)
+    if method is not None:
+        updates['method'] = method
+    if precision is not None:
+        updates['precision'] = precision
+    if max_parallel_threads is not None:
+        updates['max_parallel_threads'] = max_parallel_threads
+
+    with _options_lock:
+        _options.update(updates)
+        _generation += 1
+        return dict(_options)
+
+def backend_options(**overrides):
+    """
+    Get the simulator configuration, optionally with per-call overrides.
+
+    Args:
+        **overrides: Options that take precedence over the global configuration.
+
+    Returns:
+        dict: The merged backend configuration.
+    """
+    with _options_lock:
+        options = dict(_options)
+    options.update(overrides)
+    return options
+
+def get_backend(**overrides):
+    """
+    Get the simulator backend for the calling thread.
+
+    Each thread (and each forked worker process) owns its own AerSimulator
+    instances, created on first use and reused for every later call with the
+    same configuration.
+
+    Args:
+        **overrides: Options that take precedence over the global configuration.
+
+    Returns:
+        AerSimulator: The shared simulator backend.
+    """
+    pid = os.getpid()
+    if getattr(_local, 'generation', None) != _generation or getattr(_local, 'pid', None) != pid:
+        _local.backends = {}
+        _local.generation = _generation
+        _local.pid = pid
+
+    options = backend_options(**overrides)
+    key = tuple(sorted((name, repr(value)) for name, value in options.items()))
+    backend = _local.backends.get(key)
+    if backend is None:
+        backend = AerSimulator(**options)
+        _local.backends[key] = backend
+    return backend
+
+def backend_for(circuits, **overrides):
+    """
+    Get the simulator backend suited to the given circuits.
+
+    With the 'automatic' method, circuits made only of Clifford gates are
+    routed to the stabilizer method, whose memory grows polynomially with the
+    number of qubits instead of as 2^n. An explicitly chosen method is kept.
+
+    Args:
+        circuits: The quantum circuit, or a list of circuits run as one job.
+        **overrides: Options that take precedence over the global configuration.
+
+    Returns:
+        AerSimulator: The shared simulator backend.
+    """
+    if not isinstance(circuits, (list, tuple)):
+        circuits = [circuits]
+    if backend_options(**overrides)['method'] == 'automatic' and all(is_clifford_circuit(qc) for qc in circuits):
+        overrides['method'] = 'stabilizer'
+    return get_backend(**overrides)
+
+def reset_backends():
+    """Restore the default configuration and drop all pooled backends."""
+    global _generation
+    with _options_lock:
+        _options.clear()
+        _options.update(_DEFAULT_OPTIONS)
+        _generation += 1
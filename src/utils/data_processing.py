@@ -1,7 +1,53 @@
 import json
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import re
 
+# A quoted string, a Python literal, or a bare key in front of a colon
+_TOKEN = re.compile(r"""'((?:[^'\\]|\\.)*)'|("(?:[^"\\]|\\.)*")|\b(True|False|None)\b|([A-Za-z_]\w*)(?=\s*:)""")
+_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+# Column name prefix of the typed parameter columns
+PARAMETER_PREFIX = 'param_'
+
+def _to_json(match):
+    single, double, literal, key = match.groups()
+    if key is not None:
+        return f'"{key}"'
+    if literal is not None:
+        return _LITERALS[literal]
+    if double is not None:
+        return double
+    return json.dumps(single.replace("\\'", "'"))
+
+@lru_cache(maxsize=65536)
+def _parse_cached(parameters):
+    try:
+        parsed = json.loads(_TOKEN.sub(_to_json, parameters))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Cannot parse parameters {parameters!r}: {e}") from None
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Parameters {parameters!r} are not a mapping")
+    return parsed
+
+def parse_parameter_string(parameters):
+    """
+    Parse a parameters string such as "{n: 4, target: 3}" or "{'number': 15}".
+    
+    Keys may be bare or quoted, strings may use single or double quotes, and
+    True/False/None are accepted. Results are memoized per string.
+    
+    Args:
+        parameters (str): The parameters as a string.
+        
+    Returns:
+        dict: The parameters as a dictionary.
+        
+    Raises:
+        ValueError: If the string cannot be parsed.
+    """
+    return dict(_parse_cached(parameters))
+
 def parse_parameters(parameters):
     """
     Parse the parameters column from a string to a dictionary.
@@ -10,22 +56,54 @@ def parse_parameters(parameters):
         parameters (str): The parameters as a string.
         
     Returns:
-        dict: The parameters as a dictionary.
+        dict: The parameters as a dictionary, or an empty dictionary if the string cannot be parsed.
     """
     try:
-        # Replace single quotes with double quotes
-        parameters = parameters.replace("'", '"')
-        
-        # Ensure keys are quoted
-        parameters = re.sub(r'(\w+):', r'"\1":', parameters)
-        
-        # Attempt to load the JSON string
-        return json.loads(parameters)
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        print(f"Problematic string: {parameters}")
+        return parse_parameter_string(parameters)
+    except ValueError:
         return {}
 
+def parse_parameters_column(parameters):
+    """
+    Parse a whole column of parameter strings.
+    
+    Each distinct string is parsed once, and every row that holds it gets its
+    own copy of the result. Rows that cannot be parsed get an empty dictionary and are
+    listed in the error report instead of being printed.
+    
+    Args:
+        parameters (pd.Series): The parameter strings.
+        
+    Returns:
+        tuple: The parsed dictionaries as a Series aligned with the input, and
+        a DataFrame with the index, parameters and error of every failed row.
+    """
+    codes, uniques = pd.factorize(parameters)
+    
+    # The extra last slot holds missing values, which factorize codes as -1
+    parsed = np.empty(len(uniques) + 1, dtype=object)
+    errors = np.empty(len(uniques) + 1, dtype=object)
+    for code, text in enumerate(uniques):
+        try:
+            parsed[code] = _parse_cached(text)
+        except (ValueError, TypeError) as e:
+            parsed[code] = {}
+            errors[code] = str(e)
+    parsed[-1] = {}
+    errors[-1] = "Missing parameters"
+    
+    row_errors = errors[codes]
+    failed = np.not_equal(row_errors, None)
+    report = pd.DataFrame({
+        'index': parameters.index[failed],
+        'parameters': parameters[failed].to_numpy(),
+        'error': row_errors[failed]
+    })
+    # Copy per row so that changing one row's dictionary leaves the others and the parse cache intact
+    rows = np.empty(len(codes), dtype=object)
+    rows[:] = [dict(parsed[code]) for code in codes]
+    return pd.Series(rows, index=parameters.index, name=parameters.name), report
+
 def clean_data(df):
     """
     Clean the dataset by dropping rows with missing values and parsing parameters.
@@ -40,7 +118,7 @@ def clean_data(df):
     df = df.dropna()
     
     # Convert the parameters column to a dictionary
-    df['parameters'] = df['parameters'].apply(parse_parameters)
+    df['parameters'], _ = parse_parameters_column(df['parameters'])
     
     return df
 
@@ -71,4 +149,67 @@ def split_dataset(df, test_size=0.2):
     """
     train_df = df.sample(frac=1 - test_size, random_state=42)
     test_df = df.drop(train_df.index)
-    return train_df, test_df
\ No newline at end of file
+    return train_df, test_df
+
+def _column_dtype(values):
+    """Pick a nullable pandas dtype that keeps the Python type of every present value."""
+    types = {type(value) for value in values if value is not None}
+    if types == {bool}:
+        return 'boolean'
+    if types == {int}:
+        return 'Int64'
+    if types and types <= {int, float}:
+        return 'Float64'
+    if types == {str}:
+        return 'string'
+    return object
+
+def parameter_columns(parameters, prefix=PARAMETER_PREFIX):
+    """
+    Spread parsed parameter dictionaries into one typed column per key.
+    
+    Integer, float, boolean and string parameters get nullable pandas dtypes,
+    so rows without a key hold a missing value instead of changing the type
+    of the column. Other values such as lists are kept as objects.
+    
+    Args:
+        parameters (pd.Series): The parsed parameter dictionaries.
+        prefix (str): The prefix of the column names.
+        
+    Returns:
+        pd.DataFrame: The parameter columns, aligned with the input.
+    """
+    keys = list(dict.fromkeys(key for row in parameters for key in row))
+    columns = {}
+    for key in keys:
+        values = [row.get(key) for row in parameters]
+        columns[prefix + key] = pd.Series(values, index=parameters.index, dtype=_column_dtype(values))
+    return pd.DataFrame(columns, index=parameters.index)
+
+def _to_python(value):
+    # Nested lists are read back from Parquet as NumPy arrays
+    if isinstance(value, np.ndarray):
+        return [_to_python(item) for item in value] if value.dtype == object else value.tolist()
+    return value
+
+def parameters_from_columns(df, prefix=PARAMETER_PREFIX):
+    """
+    Rebuild the parameter dictionaries from typed parameter columns.
+    
+    Args:
+        df (pd.DataFrame): The dataset with parameter columns.
+        prefix (str): The prefix of the column names.
+        
+    Returns:
+        list: The parameter dictionary of each row; missing values are left out.
+    """
+    names = [column for column in df.columns if column.startswith(prefix)]
+    if not names:
+        return [{} for _ in range(len(df))]
+    
+    keys = [column[len(prefix):] for column in names]
+    columns = [df[column].tolist() for column in names]
+    return [
+        {key: _to_python(value) for key, value in zip(keys, values) if value is not None and value is not pd.NA}
+        for values in zip(*columns)
+    ]
\ No newline at end of file
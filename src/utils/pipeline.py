@@ -0,0 +1,47 @@
+import time
+from .batch import run_circuits
+
+# The stages of a pipelined run, in order
+STAGES = ('build', 'compile', 'execute', 'post_process')
+
+def run_pipeline(build_circuit, post_process, parameters, timings=None):
+    """
+    Run an algorithm as build -> compile -> execute -> post-process.
+    
+    Only the circuit the row measures is built, compiled through the
+    transpile cache and executed; post-processing turns the counts into
+    the accuracy.
+    
+    Args:
+        build_circuit (callable): Builds the measured circuit from the parameters.
+        post_process (callable): Computes the accuracy from the counts and parameters.
+        parameters (dict): The parameters of the run, including optional 'shots' and 'seed'.
+        timings (dict): If given, receives the time of each stage in seconds.
+        
+    Returns:
+        dict: The result counts and accuracy.
+    """
+    if timings is None:
+        timings = {}
+    start_time = time.time()
+    qc = build_circuit(parameters)
+    timings['build'] = time.time() - start_time
+    
+    counts = run_circuits([qc], shots=parameters.get('shots', 1000), seed=parameters.get('seed'), timings=timings)[0]
+    
+    start_time = time.time()
+    accuracy = post_process(counts, parameters)
+    timings['post_process'] = time.time() - start_time
+    return {'result_counts': counts, 'accuracy': accuracy}
+
+def stage_times(timings):
+    """
+    Get the result columns of the stage times.
+    
+    Args:
+        timings (dict): The time of each stage that ran.
+        
+    Returns:
+        dict: The '<stage>_time' of every stage, None for stages that did not run.
+    """
+    return {f'{stage}_time': timings.get(stage) for stage in STAGES}
\ No newline at end of file
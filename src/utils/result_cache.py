@@ -0,0 +1,157 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+from importlib.metadata import version
+
+# On-disk memoization of algorithm results; disabled until a directory is configured
+_config = {'directory': None, 'max_bytes': 1 << 30}
+_lock = threading.Lock()
+_stored_bytes = {}
+
+# Results from other library versions may differ, so the versions are part of every key;
+# they are read from the package metadata to avoid importing the libraries themselves
+_VERSIONS = {name: version(name) for name in ('qiskit', 'qiskit-aer', 'numpy')}
+
+def configure_result_cache(directory, max_bytes=None):
+    """
+    Enable or disable the on-disk result cache.
+    
+    Args:
+        directory (str): The cache directory, or None to disable the cache.
+        max_bytes (int): The size bound; the least recently used results are evicted first.
+    """
+    if max_bytes is not None and max_bytes < 1:
+        raise ValueError(f"Cache size must be positive, got {max_bytes}")
+    with _lock:
+        _config['directory'] = directory
+        if max_bytes is not None:
+            _config['max_bytes'] = max_bytes
+
+def result_cache_config():
+    """Return the result cache directory and size bound."""
+    with _lock:
+        return dict(_config)
+
+def _json_default(value):
+    # NumPy scalars and arrays in parameters
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def result_key(algorithm, parameters):
+    """
+    Compute the content address of an algorithm run.
+    
+    The key covers the algorithm name, the canonicalized parameters, the shot
+    count, the seed and the library versions. Plotting options are ignored.
+    
+    Args:
+        algorithm (str): The algorithm name.
+        parameters (dict): The parameters of the run.
+        
+    Returns:
+        str: The hexadecimal key.
+    """
+    parameters = {key: value for key, value in parameters.items() if key != 'plot'}
+    # An explicit default shot count is the same run as an omitted one
+    parameters.setdefault('shots', 1000)
+    parameters.setdefault('seed', None)
+    payload = {'algorithm': algorithm, 'parameters': parameters, 'versions': _VERSIONS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=_json_default).encode()).hexdigest()
+
+def _path(directory, key):
+    return os.path.join(directory, key[:2], key + '.pkl')
+
+def load_result(key):
+    """
+    Get a cached result.
+    
+    Args:
+        key (str): The result key.
+        
+    Returns:
+        The stored result, or None if the cache is disabled or holds no result for the key.
+    """
+    directory = _config['directory']
+    if directory is None:
+        return None
+    path = _path(directory, key)
+    try:
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError):
+        # A result cut short by a crash
+        os.remove(path)
+        return None
+    # Mark the result as recently used for eviction
+    os.utime(path)
+    return result
+
+def store_result(key, result):
+    """
+    Store a result, evicting the least recently used results beyond the size bound.
+    
+    Args:
+        key (str): The result key.
+        result: The picklable result.
+    """
+    directory = _config['directory']
+    if directory is None:
+        return
+    path = _path(directory, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial_path = f'{path}.{os.getpid()}.partial'
+    with open(partial_path, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial_path, path)
+    
+    with _lock:
+        # Other processes may share the directory, so the running total is
+        # only an estimate; it is recounted from disk whenever it exceeds the bound
+        if directory not in _stored_bytes:
+            _stored_bytes[directory] = _disk_usage(directory)
+        else:
+            _stored_bytes[directory] += os.path.getsize(path)
+        if _stored_bytes[directory] > _config['max_bytes']:
+            _stored_bytes[directory] = _evict(directory, _config['max_bytes'])
+
+def _entries(directory):
+    entries = []
+    for path in glob.glob(os.path.join(directory, '*', '*.pkl')):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+def _disk_usage(directory):
+    return sum(size for _, size, _ in _entries(directory))
+
+def _evict(directory, max_bytes):
+    """Delete the least recently used results until the cache fits; return the remaining size."""
+    entries = sorted(_entries(directory))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
+
+def clear_result_cache():
+    """Delete every stored result."""
+    directory = _config['directory']
+    if directory is not None:
+        shutil.rmtree(directory, ignore_errors=True)
+    with _lock:
+        _stored_bytes.pop(directory, None)
\ No newline at end of file
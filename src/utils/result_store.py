@@ -0,0 +1,81 @@
+import pandas as pd
+
+COUNTS_COLUMN = 'result_counts'
+
+def write_results(results, table_path, counts_path):
+    """
+    Write experiment results as Parquet tables.
+
+    Scalar fields go to the results table with one row per experiment. The
+    result counts go to a separate long-format table with one row per
+    (experiment, bitstring), so neither table holds stringified dicts.
+
+    Args:
+        results (list): The result dict of each experiment.
+        table_path (str): The Parquet file for the results table.
+        counts_path (str): The Parquet file for the counts table.
+    """
+    results_df = pd.DataFrame(results)
+    results_df.insert(0, 'row', range(len(results_df)))
+    counts = results_df.pop(COUNTS_COLUMN) if COUNTS_COLUMN in results_df else pd.Series([None] * len(results_df))
+
+    rows, bitstrings, frequencies = [], [], []
+    for row, row_counts in enumerate(counts):
+        if isinstance(row_counts, dict):
+            rows.extend([row] * len(row_counts))
+            bitstrings.extend(row_counts)
+            frequencies.extend(row_counts.values())
+    counts_df = pd.DataFrame({
+        'row': pd.array(rows, dtype='int64'),
+        'bitstring': pd.array(bitstrings, dtype='string'),
+        'count': pd.array(frequencies, dtype='int64')
+    })
+
+    results_df.to_parquet(table_path, index=False)
+    counts_df.to_parquet(counts_path, index=False)
+
+def read_results(table_path, columns=None):
+    """
+    Read the results table, loading only the requested columns.
+
+    Args:
+        table_path (str): The Parquet file of the results table.
+        columns (list): The columns to load; columns missing from the table are skipped.
+
+    Returns:
+        pd.DataFrame: The results.
+    """
+    if columns is not None:
+        import pyarrow.parquet as pq
+        available = set(pq.read_schema(table_path).names)
+        columns = [column for column in columns if column in available]
+    return pd.read_parquet(table_path, columns=columns)
+
+def read_counts(counts_path, rows=None):
+    """
+    Read the long-format counts table.
+
+    Args:
+        counts_path (str): The Parquet file of the counts table.
+        rows (list): Only load the counts of these experiment rows.
+
+    Returns:
+        pd.DataFrame: The 'row', 'bitstring' and 'count' columns.
+    """
+    filters = [('row', 'in', list(rows))] if rows is not None else None
+    return pd.read_parquet(counts_path, filters=filters)
+
+def counts_by_row(counts_df):
+    """
+    Rebuild the counts dict of each experiment from the long-format table.
+
+    Args:
+        counts_df (pd.DataFrame): The counts table.
+
+    Returns:
+        dict: The counts dict of each experiment row.
+    """
+    return {
+        row: dict(zip(group['bitstring'], group['count'].tolist()))
+        for row, group in counts_df.groupby('row', sort=True)
+    }
@@ -0,0 +1,298 @@
+import numpy as np
+
+# Gates the tableau applies directly; compositions of them are followed through their definitions
+CLIFFORD_GATES = frozenset({'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'sx', 'sxdg', 'cx', 'cy', 'cz', 'swap'})
+_IGNORED = frozenset({'barrier', 'delay'})
+# Everything a circuit may contain and still run on the tableau
+_CLIFFORD_OPERATIONS = CLIFFORD_GATES | _IGNORED | {'measure'}
+
+class Tableau:
+    """
+    A stabilizer tableau of a Clifford state (Aaronson and Gottesman's CHP).
+    
+    Rows 0..n-1 are the destabilizers and rows n..2n-1 the stabilizers; row
+    2n is scratch space. The sign of every row is kept as an affine function
+    of the random measurement outcomes seen so far, so a single pass over a
+    circuit describes the distribution of all of its measurement outcomes.
+    """
+    
+    def __init__(self, num_qubits, max_random=0):
+        """
+        Args:
+            num_qubits (int): The number of qubits, all starting in |0>.
+            max_random (int): The largest number of random measurement outcomes to track.
+        """
+        n = num_qubits
+        self.num_qubits = n
+        self.x = np.zeros((2 * n + 1, n), dtype=bool)
+        self.z = np.zeros((2 * n + 1, n), dtype=bool)
+        self.x[np.arange(n), np.arange(n)] = True
+        self.z[np.arange(n, 2 * n), np.arange(n)] = True
+        # Column 0 is the constant part of each sign, column j the coefficient of random outcome j
+        self.r = np.zeros((2 * n + 1, max_random + 1), dtype=bool)
+        self.num_random = 0
+    
+    def h(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+    
+    def s(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+    
+    def sdg(self, a):
+        self.r[:, 0] ^= self.x[:, a] & ~self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+    
+    def x_gate(self, a):
+        self.r[:, 0] ^= self.z[:, a]
+    
+    def y_gate(self, a):
+        self.r[:, 0] ^= self.x[:, a] ^ self.z[:, a]
+    
+    def z_gate(self, a):
+        self.r[:, 0] ^= self.x[:, a]
+    
+    def cx(self, a, b):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+    
+    def _rowsum(self, h, i):
+        """Multiply row h by row i, keeping track of the sign."""
+        x1, z1, x2, z2 = self.x[i], self.z[i], self.x[h], self.z[h]
+        # The power of i each qubit contributes to the product of the two Paulis
+        g = np.where(x1 & z1, z2.astype(int) - x2,
+            np.where(x1, z2 * (2 * x2.astype(int) - 1),
+            np.where(z1, x2 * (1 - 2 * z2.astype(int)), 0)))
+        self.r[h] ^= self.r[i]
+        self.r[h, 0] ^= bool(g.sum() % 4 // 2)
+        self.x[h] ^= x1
+        self.z[h] ^= z1
+    
+    def measure(self, a):
+        """
+        Measure qubit a in the computational basis.
+        
+        Returns:
+            np.ndarray: The outcome as an affine function of the random outcomes (constant first).
+        """
+        n = self.num_qubits
+        anticommuting = np.flatnonzero(self.x[n:2 * n, a])
+        if anticommuting.size:
+            p = n + anticommuting[0]
+            for i in np.flatnonzero(self.x[:2 * n, a]):
+                if i != p:
+                    self._rowsum(i, p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = False
+            self.z[p] = False
+            self.z[p, a] = True
+            self.num_random += 1
+            if self.num_random >= self.r.shape[1]:
+                raise ValueError("The circuit has more random measurements than the tableau tracks")
+            self.r[p] = False
+            self.r[p, self.num_random] = True
+            return self.r[p].copy()
+        
+        scratch = 2 * n
+        self.x[scratch] = False
+        self.z[scratch] = False
+        self.r[scratch] = False
+        for i in np.flatnonzero(self.x[:n, a]):
+            self._rowsum(scratch, i + n)
+        return self.r[scratch].copy()
+    
+    def apply(self, name, qubits):
+        """Apply a Clifford gate by name."""
+        if name == 'h':
+            self.h(*qubits)
+        elif name == 's':
+            self.s(*qubits)
+        elif name == 'sdg':
+            self.sdg(*qubits)
+        elif name == 'x':
+            self.x_gate(*qubits)
+        elif name == 'y':
+            self.y_gate(*qubits)
+        elif name == 'z':
+            self.z_gate(*qubits)
+        elif name == 'sx':
+            # sqrt(X) = H S H up to a global phase
+            self.h(*qubits)
+            self.s(*qubits)
+            self.h(*qubits)
+        elif name == 'sxdg':
+            self.h(*qubits)
+            self.sdg(*qubits)
+            self.h(*qubits)
+        elif name == 'cx':
+            self.cx(*qubits)
+        elif name == 'cy':
+            a, b = qubits
+            self.sdg(b)
+            self.cx(a, b)
+            self.s(b)
+        elif name == 'cz':
+            a, b = qubits
+            self.h(b)
+            self.cx(a, b)
+            self.h(b)
+        elif name == 'swap':
+            a, b = qubits
+            self.cx(a, b)
+            self.cx(b, a)
+            self.cx(a, b)
+        elif name != 'id':
+            raise ValueError(f"{name} is not a Clifford gate")
+
+def is_clifford_circuit(qc):
+    """
+    Check whether a circuit contains only Clifford gates and measurements.
+    
+    Composite gates are checked through their definitions.
+    
+    Args:
+        qc (QuantumCircuit): The quantum circuit.
+        
+    Returns:
+        bool: Whether the circuit can be simulated with a stabilizer tableau.
+    """
+    for instruction in qc.data:
+        operation = instruction.operation
+        if operation.name in _CLIFFORD_OPERATIONS:
+            continue
+        if operation.params or operation.definition is None or not is_clifford_circuit(operation.definition):
+            return False
+    return True
+
+def _count_measurements(qc):
+    count = 0
+    for instruction in qc.data:
+        operation = instruction.operation
+        if operation.name == 'measure':
+            count += 1
+        elif operation.name not in CLIFFORD_GATES and operation.name not in _IGNORED and operation.definition is not None:
+            count += _count_measurements(operation.definition)
+    return count
+
+def _run(tableau, qc, qubits, clbits, outcomes):
+    """Apply a circuit to the tableau, recording the affine outcome of every classical bit."""
+    for instruction in qc.data:
+        operation = instruction.operation
+        targets = [qubits[qc.find_bit(q).index] for q in instruction.qubits]
+        if getattr(operation, 'condition', None) is not None:
+            raise ValueError(f"Classically controlled {operation.name} cannot be simulated exactly")
+        if operation.name == 'measure':
+            outcomes[clbits[qc.find_bit(instruction.clbits[0]).index]] = tableau.measure(targets[0])
+        elif operation.name in CLIFFORD_GATES:
+            tableau.apply(operation.name, targets)
+        elif operation.name in _IGNORED:
+            continue
+        elif operation.definition is not None and not operation.params:
+            definition = operation.definition
+            _run(tableau, definition, targets, [clbits[qc.find_bit(c).index] for c in instruction.clbits], outcomes)
+        else:
+            raise ValueError(f"{operation.name} is not supported by the stabilizer simulator")
+
+def measurement_outcomes(qc):
+    """
+    Describe the measurement outcomes of a Clifford circuit.
+    
+    Every classical bit is an affine function over GF(2) of k uniformly random
+    bits, so the outcome distribution is uniform over an affine subspace.
+    
+    Args:
+        qc (QuantumCircuit): A circuit of Clifford gates and measurements.
+        
+    Returns:
+        np.ndarray: A (num_clbits, k + 1) boolean matrix; row c holds the constant
+            and the random-bit coefficients of classical bit c.
+    """
+    tableau = Tableau(qc.num_qubits, max_random=_count_measurements(qc))
+    outcomes = np.zeros((qc.num_clbits, tableau.r.shape[1]), dtype=bool)
+    _run(tableau, qc, list(range(qc.num_qubits)), list(range(qc.num_clbits)), outcomes)
+    return outcomes[:, :tableau.num_random + 1]
+
+def _bitstrings(bits):
+    # Qiskit order: classical bit 0 is the rightmost character
+    return [''.join('1' if bit else '0' for bit in row[::-1]) for row in bits]
+
+def _independent_columns(matrix):
+    """Return the indices of a basis of the column space of a GF(2) matrix."""
+    matrix = matrix.copy()
+    pivots = []
+    row = 0
+    for column in range(matrix.shape[1]):
+        candidates = np.flatnonzero(matrix[row:, column]) + row if row < matrix.shape[0] else []
+        if len(candidates) == 0:
+            continue
+        pivot = candidates[0]
+        matrix[[row, pivot]] = matrix[[pivot, row]]
+        below = np.flatnonzero(matrix[:, column])
+        below = below[below != row]
+        matrix[below] ^= matrix[row]
+        pivots.append(column)
+        row += 1
+    return pivots
+
+def exact_distribution(qc, max_outcomes=2 ** 16):
+    """
+    Compute the exact outcome probabilities of a Clifford circuit.
+    
+    Args:
+        qc (QuantumCircuit): A circuit of Clifford gates and measurements.
+        max_outcomes (int): The largest number of distinct outcomes to enumerate.
+        
+    Returns:
+        dict: The probability of each possible bitstring.
+    """
+    outcomes = measurement_outcomes(qc)
+    constant, generators = outcomes[:, 0], outcomes[:, 1:]
+    basis = generators[:, _independent_columns(generators)]
+    rank = basis.shape[1]
+    if 2 ** rank > max_outcomes:
+        raise ValueError(f"The circuit has {2 ** rank} equally likely outcomes; sample them with sample_counts")
+    
+    choices = (np.arange(2 ** rank)[:, None] >> np.arange(rank)) & 1
+    bits = constant ^ (choices @ basis.T.astype(int) % 2).astype(bool)
+    probability = 1 / 2 ** rank
+    return {bitstring: probability for bitstring in _bitstrings(bits)}
+
+def sample_counts(qc, shots=1000, seed=None):
+    """
+    Sample measurement counts of a Clifford circuit.
+    
+    Args:
+        qc (QuantumCircuit): A circuit of Clifford gates and measurements.
+        shots (int): The number of samples.
+        seed (int): The seed of the random number generator.
+        
+    Returns:
+        dict: The counts of each sampled bitstring.
+    """
+    outcomes = measurement_outcomes(qc)
+    constant, generators = outcomes[:, 0], outcomes[:, 1:]
+    rng = np.random.default_rng(seed)
+    choices = rng.integers(0, 2, size=(shots, generators.shape[1]))
+    bits = constant ^ (choices @ generators.T.astype(int) % 2).astype(bool)
+    counts = {}
+    for bitstring in _bitstrings(bits):
+        counts[bitstring] = counts.get(bitstring, 0) + 1
+    return counts
+
+def run_exact(qc, shots=None, seed=None):
+    """
+    Simulate a Clifford circuit without the sampling simulator.
+    
+    Args:
+        qc (QuantumCircuit): A circuit of Clifford gates and measurements.
+        shots (int): If given, return this many sampled counts instead of probabilities.
+        seed (int): The seed for sampling.
+        
+    Returns:
+        dict: The exact probabilities, or the sampled counts, of each bitstring.
+    """
+    if shots is None:
+        return exact_distribution(qc)
+    return sample_counts(qc, shots=shots, seed=seed)
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import ParameterExpression
+from qiskit.circuit.library.standard_gates import get_standard_gate_name_mapping
+
+# Operations fully identified by name, width and params; 'unitary' hashes its matrix, and
+# the definitions of it and of the multi-controlled gates would run a costly synthesis
+_STANDARD_GATES = frozenset(get_standard_gate_name_mapping()) | {'barrier', 'measure', 'reset', 'unitary', 'mcx', 'mcphase'}
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+_maxsize = 256
+# Metadata entry naming the backend configuration a circuit was assembled for (see mark_compiled)
+_COMPILED_FOR = 'compiled_for'
+
+def _hash_param(digest, param):
+    """Feed a single instruction parameter into the digest."""
+    if isinstance(param, ParameterExpression):
+        digest.update(b'P' + str(param).encode())
+    elif isinstance(param, np.ndarray):
+        digest.update(b'A' + str(param.shape).encode() + np.ascontiguousarray(param).tobytes())
+    else:
+        digest.update(b'V' + repr(param).encode())
+
+def _hash_circuit(digest, qc):
+    """Feed the structure of a circuit into the digest."""
+    digest.update(f'{qc.num_qubits}:{qc.num_clbits}:{qc.global_phase}'.encode())
+    for instruction in qc.data:
+        operation = instruction.operation
+        digest.update(f'|{operation.name}:{operation.num_qubits}:{operation.num_clbits}'.encode())
+        for param in operation.params:
+            _hash_param(digest, param)
+        digest.update(str([qc.find_bit(q).index for q in instruction.qubits]).encode())
+        digest.update(str([qc.find_bit(c).index for c in instruction.clbits]).encode())
+        # Custom gates may reuse a name for different bodies, so hash their definition too
+        if operation.name not in _STANDARD_GATES and operation.definition is not None:
+            _hash_circuit(digest, operation.definition)
+
+def circuit_fingerprint(qc):
+    """
+    Compute a canonical hash of a circuit's structure.
+
+    Two circuits built independently from the same inputs share a fingerprint,
+    regardless of their names. Parameters are identified by name; see
+    cached_transpile for how a hit is given the caller's Parameter objects.
+
+    Args:
+        qc (QuantumCircuit): The quantum circuit.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    digest = hashlib.sha256()
+    _hash_circuit(digest, qc)
+    return digest.hexdigest()
+
+def _backend_key(backend):
+    """Build the cache key component describing a backend configuration."""
+    options = sorted((name, repr(value)) for name, value in backend.options.items())
+    return f'{backend.name}:{options}'
+
+def mark_compiled(qc, backend):
+    """
+    Record that a circuit assembled from transpiled pieces is ready to run on a backend.
+
+    cached_transpile returns such a circuit unchanged for the same backend configuration.
+
+    Args:
+        qc (QuantumCircuit): The assembled circuit.
+        backend (AerSimulator): The backend its pieces were transpiled for.
+
+    Returns:
+        QuantumCircuit: The same circuit.
+    """
+    qc.metadata = {**(qc.metadata or {}), _COMPILED_FOR: _backend_key(backend)}
+    return qc
+
+def _with_parameters(compiled_circuit, qc):
+    """Replace the parameters of a cached circuit with the same-named parameters of qc."""
+    parameters = {param.name: param for param in qc.parameters}
+    mapping = {param: parameters[param.name] for param in compiled_circuit.parameters if parameters.get(param.name, param) != param}
+    if not mapping:
+        return compiled_circuit
+    return compiled_circuit.assign_parameters(mapping, inplace=False)
+
+def cached_transpile(qc, backend, **transpile_options):
+    """
+    Transpile a circuit for a backend, reusing earlier results for identical circuits.
+
+    The returned circuit is shared between callers and must not be modified in place.
+    A parameterized circuit hitting an entry compiled from another circuit gets a
+    copy whose parameters are the caller's objects, so it binds with them. A
+    circuit marked with mark_compiled for this backend is returned as it is.
+
+    Args:
+        qc (QuantumCircuit): The quantum circuit to transpile.
+        backend (AerSimulator): The target backend.
+        **transpile_options: Additional keyword arguments for qiskit.transpile.
+
+    Returns:
+        QuantumCircuit: The transpiled circuit.
+    """
+    if not transpile_options and (qc.metadata or {}).get(_COMPILED_FOR) == _backend_key(backend):
+        return qc
+    key = (circuit_fingerprint(qc), _backend_key(backend), repr(sorted(transpile_options.items())))
+    with _cache_lock:
+        compiled_circuit = _cache.get(key)
+        if compiled_circuit is not None:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return _with_parameters(compiled_circuit, qc)
+        _stats['misses'] += 1
+
+    compiled_circuit = transpile(qc, backend, **transpile_options)
+
+    with _cache_lock:
+        _cache[key] = compiled_circuit
+        _cache.move_to_end(key)
+        while len(_cache) > _maxsize:
+            _cache.popitem(last=False)
+    return compiled_circuit
+
+def transpile_cache_info():
+    """
+    Get the transpilation cache statistics.
+
+    Returns:
+        dict: The hit and miss counters, current size and maximum size.
+    """
+    with _cache_lock:
+        return {'hits': _stats['hits'], 'misses': _stats['misses'], 'size': len(_cache), 'maxsize': _maxsize}
+
+def set_transpile_cache_size(maxsize):
+    """
+    Set the maximum number of transpiled circuits kept in the cache.
+
+    Args:
+        maxsize (int): The maximum cache size; least recently used entries are evicted first.
+    """
+    global _maxsize
+    if maxsize < 1:
+        raise ValueError(f"Cache size must be positive, got {maxsize}")
+    with _cache_lock:
+        _maxsize = maxsize
+        while len(_cache) > _maxsize:
+            _cache.popitem(last=False)
+
+def clear_transpile_cache():
+    """Drop all cached circuits and reset the hit and miss counters."""
+    with _cache_lock:
+        _cache.clear()
+        _stats['hits'] = 0
+        _stats['misses'] = 0
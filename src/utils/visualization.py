@@ -1,10 +1,60 @@
-from qiskit.visualization import plot_histogram, plot_bloch_multivector
-from qiskit_aer import AerSimulator
-import matplotlib.pyplot as plt
+import os
+from .backend import get_backend
+
+# Plotting is opt-in: algorithms run headless unless enabled here or per call
+_plotting = {'enabled': False, 'output_dir': None}
+
+def set_plotting(enabled, output_dir=None):
+    """
+    Enable or disable histogram plotting for all algorithm runs.
+
+    Args:
+        enabled (bool): Whether algorithms should plot their result counts.
+        output_dir (str): Optional directory where histograms are saved as PNG files.
+    """
+    _plotting['enabled'] = bool(enabled)
+    _plotting['output_dir'] = output_dir
+
+def plotting_enabled():
+    """Return whether histogram plotting is globally enabled."""
+    return _plotting['enabled']
+
+def plot_counts(counts, name="histogram", plot=None):
+    """
+    Plot a histogram of result counts if plotting is enabled.
+
+    Matplotlib and qiskit.visualization are only imported when a plot is made,
+    and the figure is closed after it is saved so long sweeps do not leak figures.
+
+    Args:
+        counts (dict): The result counts to plot.
+        name (str): The file name (without extension) used when saving.
+        plot (bool): Per-call override of the global plotting mode.
+
+    Returns:
+        matplotlib.figure.Figure: The histogram figure, or None when running headless.
+    """
+    if plot is None:
+        plot = _plotting['enabled']
+    if not plot:
+        return None
+
+    from qiskit.visualization import plot_histogram
+    import matplotlib.pyplot as plt
+
+    histogram = plot_histogram(counts)
+    if _plotting['output_dir'] is not None:
+        os.makedirs(_plotting['output_dir'], exist_ok=True)
+        histogram.savefig(os.path.join(_plotting['output_dir'], f"{name}.png"))
+    plt.close(histogram)
+    return histogram
 
 def plot_results(circuit, filename="histogram.png"):
     """Execute the circuit and plot the results."""
-    simulator = AerSimulator()
+    from qiskit.visualization import plot_histogram
+    import matplotlib.pyplot as plt
+
+    simulator = get_backend()
     result = simulator.run(circuit, shots=1000).result()
     counts = result.get_counts(circuit)
     histogram = plot_histogram(counts)
@@ -14,10 +64,13 @@ def plot_results(circuit, filename="histogram.png"):
 
 def plot_statevector(circuit, filename="statevector.png"):
     """Execute the circuit and plot the statevector."""
-    simulator = AerSimulator()
+    from qiskit.visualization import plot_bloch_multivector
+    import matplotlib.pyplot as plt
+
+    simulator = get_backend()
     result = simulator.run(circuit).result()
     statevector = result.get_statevector(circuit)
     bloch_multivector = plot_bloch_multivector(statevector)
     bloch_multivector.savefig(filename)
     plt.show()
-    return bloch_multivector
\ No newline at end of file
+    return bloch_multivector
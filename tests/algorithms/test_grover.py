@@ -1,6 +1,10 @@
 import unittest
 from qiskit import QuantumCircuit
-from src.algorithms.grover import grover_search, run_grover
+from src.algorithms.grover import (
+    build_grover_circuit, diffuser, grover_batch, grover_search, grover_targets, grover_template, optimal_iterations, run_grover, run_grover_batch
+)
+from src.utils.batch import run_circuits
+from src.utils.transpile_cache import clear_transpile_cache, transpile_cache_info
 
 class TestGrover(unittest.TestCase):
 
@@ -22,5 +26,61 @@ class TestGrover(unittest.TestCase):
         
         run_grover(n, oracle)
 
+class TestGroverSearch(unittest.TestCase):
+    
+    def test_parameter_aliases(self):
+        self.assertEqual(grover_targets({'n': 8, 'target': 5}), (3, ('101',)))
+        self.assertEqual(grover_targets({'num_qubits': 3, 'targets': ['110', 1]}), (3, ('001', '110')))
+        self.assertEqual(grover_targets({}), (2, ('11',)))
+        with self.assertRaises(ValueError):
+            grover_targets({'n': 4, 'target': 4})
+        with self.assertRaises(ValueError):
+            grover_targets({'num_qubits': 3, 'target_state': '11'})
+    
+    def test_optimal_iterations(self):
+        self.assertEqual(optimal_iterations(2, 1), 1)
+        self.assertEqual(optimal_iterations(10, 1), 25)
+        self.assertEqual(optimal_iterations(10, 4), 12)
+        self.assertEqual(optimal_iterations(3, 0), 0)
+    
+    def test_targets_are_found(self):
+        for parameters in ({'n': 256, 'target': 160}, {'num_qubits': 8, 'targets': [3, 77, 200]}):
+            result = run_grover(dict(parameters, seed=3))
+            self.assertGreater(result['accuracy'], 0.95, f"Search for {parameters} missed its targets")
+    
+    def test_diffuser_is_shared(self):
+        self.assertIs(diffuser(5), diffuser(5))
+    
+    def test_targets_reuse_compiled_pieces(self):
+        clear_transpile_cache()
+        circuits = [build_grover_circuit({'num_qubits': 6, 'target': target}) for target in (3, 40, 63)]
+        # Only the diffuser and the phase flip of the width are transpiled
+        self.assertEqual(transpile_cache_info()['misses'], 2)
+        all_counts = run_circuits(circuits, shots=200, seed=1)
+        self.assertEqual(transpile_cache_info()['misses'], 2, "The assembled circuits were transpiled again")
+        for target, counts in zip((3, 40, 63), all_counts):
+            self.assertEqual(max(counts, key=counts.get), format(target, '06b'))
+
+class TestGroverBatch(unittest.TestCase):
+    
+    def test_every_target_is_found(self):
+        results = run_grover_batch({'n': 32, 'seed': 4})
+        self.assertEqual([result['target'] for result in results], list(range(32)))
+        for result in results:
+            self.assertEqual(max(result['result_counts'], key=result['result_counts'].get), format(result['target'], '05b'))
+            self.assertGreater(result['accuracy'], 0.95)
+    
+    def test_matches_single_searches(self):
+        targets = ['0110', 9, '1111']
+        all_counts = grover_batch(4, targets, seed=8)
+        for target, counts in zip(targets, all_counts):
+            single = run_grover({'num_qubits': 4, 'targets': [target], 'seed': 8})
+            bitstring = target if isinstance(target, str) else format(target, '04b')
+            self.assertAlmostEqual(counts.get(bitstring, 0) / 1000, single['accuracy'], delta=0.05)
+        self.assertEqual(grover_batch(4, []), [])
+    
+    def test_template_is_shared(self):
+        self.assertIs(grover_template(4, 3), grover_template(4, 3))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
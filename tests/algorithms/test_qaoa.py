@@ -1,5 +1,17 @@
 import unittest
-from src.algorithms.qaoa import qaoa_algorithm
+from unittest.mock import patch
+import numpy as np
+from qiskit.quantum_info import Statevector
+from scipy.sparse import csr_matrix
+from src.algorithms.qaoa import (
+    basis_bits, bitstring_bits, build_qaoa_circuit, counts_cut_values, cut_values,
+    problem_graph, qaoa_algorithm, qaoa_expectations, qaoa_landscape, run_qaoa
+)
+from src.utils.backend import get_backend
+
+def complete_graph_cut_values(num_qubits):
+    num_qubits, edges, weights = problem_graph({'num_qubits': num_qubits})
+    return cut_values(basis_bits(num_qubits), edges, weights)
 
 class TestQAOA(unittest.TestCase):
 
@@ -17,5 +29,75 @@ class TestQAOA(unittest.TestCase):
         self.assertTrue(isinstance(result, list), "QAOA algorithm result is not a list")
         self.assertGreater(len(result), 0, "QAOA algorithm result list is empty")
 
+class TestQAOAEngine(unittest.TestCase):
+
+    def test_per_layer_angles(self):
+        result = run_qaoa({'num_qubits': 3, 'p': 2, 'gamma': [0.3, 0.5], 'beta': [0.2, 0.1]})
+        self.assertEqual(sum(result['result_counts'].values()), 1000)
+        with self.assertRaises(ValueError):
+            qaoa_algorithm({'num_qubits': 3, 'p': 2, 'gamma': [0.1, 0.2, 0.3]})
+
+    def test_expectations_match_statevector(self):
+        qc = build_qaoa_circuit(3, 2)
+        qc.remove_final_measurements()
+        bound = qc.assign_parameters({'β[0]': 0.1, 'β[1]': 0.2, 'γ[0]': 0.3, 'γ[1]': 0.4})
+        expected = Statevector(bound).probabilities() @ complete_graph_cut_values(3)
+        values = qaoa_expectations({'num_qubits': 3, 'p': 2}, [[0.3, 0.4]], [[0.1, 0.2]])
+        self.assertAlmostEqual(values[0], expected)
+
+    def test_landscape_shape(self):
+        landscape = qaoa_landscape({'num_qubits': 3, 'p': 1}, np.linspace(0, np.pi, 7), np.linspace(0, np.pi, 5), batch_size=8)
+        self.assertEqual(landscape.shape, (7, 5))
+        # With γ = 0 the mixer only adds a phase, so the expected cut is the uniform average
+        np.testing.assert_allclose(landscape[0], np.mean(complete_graph_cut_values(3)))
+
+    def test_angle_sets_run_in_parallel(self):
+        for estimator in ('statevector', 'shots'):
+            with patch('src.algorithms.qaoa.get_backend', wraps=get_backend) as backend:
+                qaoa_expectations({'num_qubits': 3, 'estimator': estimator, 'shots': 100}, [0.1, 0.2], [0.3, 0.4])
+            self.assertEqual(backend.call_args.kwargs.get('max_parallel_experiments'), 0)
+
+class TestQAOAGraph(unittest.TestCase):
+
+    def test_problem_graph_formats(self):
+        adjacency = np.array([[0, 2, 0], [2, 0, 1], [0, 1, 0]])
+        for parameters in ({'graph': [(0, 1, 2.0), (1, 2)]},
+                           {'graph': [(0, 1), (1, 2)], 'weights': [2.0, 1.0]},
+                           {'adjacency': adjacency},
+                           {'adjacency': csr_matrix(adjacency)}):
+            num_qubits, edges, weights = problem_graph(parameters)
+            self.assertEqual(num_qubits, 3)
+            self.assertEqual(edges.tolist(), [[0, 1], [1, 2]])
+            self.assertEqual(weights.tolist(), [2.0, 1.0])
+
+    def test_circuit_only_has_real_edges(self):
+        num_qubits, edges, weights = problem_graph({'graph': [(0, 1), (2, 3)]})
+        qc = build_qaoa_circuit(num_qubits, 2, edges, weights)
+        self.assertEqual(qc.count_ops()['rzz'], 4, "Expected one ZZ rotation per edge and layer")
+
+    def test_cut_kernel(self):
+        bits = bitstring_bits(['0011', '0101'], 4)
+        self.assertEqual(bits[0].tolist(), [True, True, False, False])
+        values = cut_values(bits, np.array([[0, 1], [1, 2], [2, 3]]), np.array([1.0, 2.0, 3.0]))
+        self.assertEqual(values.tolist(), [2.0, 6.0])
+        summary = counts_cut_values({'0101': 3, '0011': 1}, {'graph': [(0, 1), (1, 2, 2.0), (2, 3, 3.0)]})
+        self.assertEqual(summary['best_bitstring'], '0101')
+        self.assertAlmostEqual(summary['expected_cut'], 5.0)
+
+    def test_sparse_graph_with_sampling(self):
+        ring = [(i, (i + 1) % 20) for i in range(20)]
+        result = run_qaoa({'graph': ring, 'p': 1, 'gamma': 0.4, 'beta': 0.3, 'shots': 200})
+        self.assertEqual(len(next(iter(result['result_counts']))), 20)
+        values = qaoa_expectations({'graph': ring, 'p': 1, 'estimator': 'shots', 'shots': 200}, [0.0, 0.4], [0.3, 0.3])
+        self.assertEqual(values.shape, (2,))
+        # With γ = 0 the samples are uniform, cutting half of the ring's edges on average
+        self.assertAlmostEqual(values[0], 10.0, delta=1.0)
+
+    def test_edgeless_graphs(self):
+        for parameters in ({'num_qubits': 3, 'graph': []}, {'num_qubits': 1}):
+            result = run_qaoa(dict(parameters, shots=100))
+            self.assertEqual(result['expected_cut'], 0.0)
+            self.assertEqual(qaoa_expectations(parameters, [0.1, 0.2], [0.3, 0.4]).tolist(), [0.0, 0.0])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
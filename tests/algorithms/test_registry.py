@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from src.algorithms import registry
+from src.algorithms.registry import get_algorithm, register_algorithm, resolve
+
+class TestRegistry(unittest.TestCase):
+    
+    def test_algorithm_modules_are_imported_on_first_use(self):
+        code = (
+            "import sys; import scripts.run_experiment; "
+            "print(sorted(name for name in ('src.algorithms.grover', 'src.algorithms.qpe', 'src.algorithms.shor', 'matplotlib') if name in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.join(os.path.dirname(__file__), '..', '..')).stdout
+        self.assertEqual(output.strip(), '[]')
+    
+    def test_entry_points_resolve(self):
+        from src.algorithms.grover import build_grover_circuit, run_grover
+        self.assertEqual(get_algorithm('Search'), ('Grover', run_grover))
+        self.assertIs(resolve(registry.BATCHABLE['Search'][0]), build_grover_circuit)
+        with self.assertRaises(ValueError):
+            get_algorithm('Unknown')
+    
+    def test_register_algorithm(self):
+        def entry_point(parameters):
+            return {'accuracy': 1.0}
+        
+        with patch.dict(registry.ALGORITHMS), patch.dict(registry.BATCHABLE):
+            register_algorithm('Search', 'Custom', entry_point)
+            self.assertEqual(get_algorithm('Search'), ('Custom', entry_point))
+            self.assertNotIn('Search', registry.BATCHABLE)
+            with self.assertRaises(ValueError):
+                register_algorithm('Search', 'Custom', entry_point, build_circuit=entry_point)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
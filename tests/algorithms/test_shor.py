@@ -1,5 +1,10 @@
 import unittest
-from src.algorithms.shor import shor_algorithm
+from unittest.mock import patch
+import numpy as np
+from qiskit.quantum_info import Operator
+from src.algorithms.shor import (
+    c_amodN, clear_order_cache, decode_order, factors_from_order, find_order, find_orders, shor_algorithm
+)
 
 class TestShor(unittest.TestCase):
 
@@ -10,5 +15,80 @@ class TestShor(unittest.TestCase):
         self.assertTrue(isinstance(result, tuple), "Shor's algorithm result is not a tuple")
         self.assertEqual(len(result), 2, "Shor's algorithm result does not contain two factors")
 
+class TestShorOrderFinding(unittest.TestCase):
+    
+    def test_gates_are_memoized(self):
+        self.assertIs(c_amodN(7, 4, 15), c_amodN(7, 4, 15), "Modular multiplication gate was rebuilt")
+    
+    def test_decode_order_uses_whole_distribution(self):
+        # Phases 1/4 and 3/4 alone give denominator 4; 1/2 alone gives 2, which is not the order of 7
+        self.assertEqual(decode_order({'00000000': 500, '10000000': 300, '01000000': 100}, 7, 15), 4)
+        self.assertIsNone(decode_order({'00000000': 1000}, 7, 15))
+        # Phase 1/4 verifies 4, a multiple of the order 2 of 4 modulo 15
+        self.assertEqual(decode_order({'01000000': 1000}, 4, 15), 2)
+    
+    def test_factors_from_order(self):
+        self.assertEqual(factors_from_order(7, 4, 15), (3, 5))
+        self.assertIsNone(factors_from_order(7, 3, 15))
+    
+    def test_order_is_cached(self):
+        clear_order_cache()
+        order = find_order(7, 15)
+        self.assertEqual(order, 4)
+        self.assertEqual(find_order(7, 15), order)
+    
+    def test_failed_attempts_are_not_cached(self):
+        clear_order_cache()
+        with patch('src.algorithms.shor.decode_order', return_value=None):
+            self.assertEqual(find_orders([7, 2], 15), [None, None])
+        self.assertEqual(find_orders([7, 2], 15), [4, 4])
+    
+    def test_classical_fast_paths(self):
+        self.assertEqual(shor_algorithm(22), (2, 11))
+        self.assertEqual(shor_algorithm(49), (7, 7))
+        with self.assertRaises(ValueError):
+            shor_algorithm(13)
+
+class TestShorGeneralN(unittest.TestCase):
+    
+    def test_modular_multiplication_permutes_basis_states(self):
+        matrix = Operator(c_amodN(2, 1, 21)).data
+        for x in range(32):
+            controlled = (x << 1) | 1
+            expected = ((2 * x) % 21 << 1) | 1 if x < 21 else controlled
+            self.assertEqual(np.argmax(np.abs(matrix[:, controlled])), expected)
+            self.assertEqual(np.argmax(np.abs(matrix[:, x << 1])), x << 1, "Uncontrolled state was changed")
+    
+    def test_modular_multiplication_mod_15(self):
+        # Includes multipliers the textbook swap patterns got wrong, such as 14 and 7^2 mod 15
+        for a, power in ((14, 1), (7, 2), (2, 3), (11, 1)):
+            matrix = Operator(c_amodN(a, power, 15)).data
+            for x in range(1, 15):
+                expected = (pow(a, power, 15) * x % 15 << 1) | 1
+                self.assertEqual(np.argmax(np.abs(matrix[:, (x << 1) | 1])), expected)
+    
+    def test_batched_orders_match_classical_orders(self):
+        clear_order_cache()
+        bases = [2, 4, 5]
+        expected = [next(r for r in range(1, 21) if pow(a, r, 21) == 1) for a in bases]
+        self.assertEqual(find_orders(bases, 21), expected)
+    
+    def test_factorizes_beyond_15(self):
+        for N in (21, 35):
+            factor1, factor2 = shor_algorithm(N)
+            self.assertEqual(factor1 * factor2, N)
+            self.assertNotIn(1, (factor1, factor2))
+    
+    def test_wide_moduli_are_refused(self):
+        # 1003 = 17 * 59 needs 10 work and 20 counting qubits
+        with self.assertRaises(ValueError):
+            shor_algorithm(1003)
+        with self.assertRaises(ValueError):
+            shor_algorithm(77)
+        with self.assertRaises(ValueError):
+            shor_algorithm(35, max_qubits=17)
+        with self.assertRaises(ValueError):
+            find_orders([2], 1003)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,12 @@
 import unittest
-from src.algorithms.vqe import vqe_algorithm
+from unittest.mock import patch
+import numpy as np
+from src.algorithms.vqe import (
+    build_ansatz, counts_expectation, parameter_shift_gradient, pauli_expectation,
+    pauli_terms, run_bindings, run_statevectors, run_vqe, vqe_algorithm
+)
+from src.utils.backend import get_backend
+from src.utils.transpile_cache import cached_transpile, clear_transpile_cache, transpile_cache_info
 
 class TestVQE(unittest.TestCase):
 
@@ -17,5 +24,79 @@ class TestVQE(unittest.TestCase):
         self.assertTrue(isinstance(result, float), "VQE algorithm result is not a float")
         self.assertGreaterEqual(result, 0, "VQE algorithm result is negative")
 
+class TestVQEEngine(unittest.TestCase):
+
+    def test_build_ansatz(self):
+        qc = build_ansatz(3, 2)
+        self.assertEqual(qc.num_parameters, 6, "Ansatz parameter count mismatch")
+
+    def test_run_bindings_batches_parameter_sets(self):
+        compiled_circuit = cached_transpile(build_ansatz(2, 1), get_backend())
+        param_sets = np.array([[0.0, 0.0], [np.pi, 0.0], [np.pi, np.pi]])
+        counts = run_bindings(compiled_circuit, param_sets, shots=100)
+        self.assertEqual(len(counts), 3, "One result per binding expected")
+        self.assertEqual(counts[0], {'00': 100})
+        self.assertEqual(counts[2], {'01': 100})
+        with patch('src.algorithms.vqe.get_backend', wraps=get_backend) as backend:
+            run_statevectors(cached_transpile(build_ansatz(2, 1, measure=False), get_backend(method='statevector')), param_sets)
+            run_bindings(compiled_circuit, param_sets, shots=100)
+        for call in backend.call_args_list:
+            self.assertEqual(call.kwargs.get('max_parallel_experiments'), 0, "Bindings were not simulated in parallel")
+
+    def test_cobyla_honours_maxiter(self):
+        with patch('src.algorithms.vqe.run_statevectors', wraps=run_statevectors) as evaluations:
+            run_vqe({'num_qubits': 2, 'ansatz_depth': 2, 'maxiter': 8})
+        self.assertLessEqual(evaluations.call_count, 8, "COBYLA ran past maxiter")
+
+    def test_seeded_runs_are_reproducible(self):
+        for estimator in ('statevector', 'shots'):
+            parameters = {'num_qubits': 2, 'ansatz_depth': 1, 'estimator': estimator, 'maxiter': 10, 'seed': 3}
+            self.assertEqual(run_vqe(parameters), run_vqe(parameters), f"Seeded {estimator} runs differ")
+
+    def test_ansatz_transpiled_once(self):
+        clear_transpile_cache()
+        result = run_vqe({'num_qubits': 2, 'ansatz_depth': 2, 'estimator': 'shots'})
+        self.assertEqual(transpile_cache_info()['misses'], 1, "Ansatz was transpiled more than once")
+        self.assertEqual(sum(result['result_counts'].values()), 1000)
+
+class TestVQEEstimator(unittest.TestCase):
+
+    def test_pauli_expectation(self):
+        plus_zero = np.array([1, 1, 0, 0]) / np.sqrt(2)  # |0>|+>
+        terms = pauli_terms([('IX', 1.0), ('ZI', 2.0), ('ZX', 0.5), ('IY', 3.0)], 2)
+        self.assertAlmostEqual(pauli_expectation(plus_zero, terms)[0], 3.5)
+
+    def test_dict_hamiltonian(self):
+        terms = pauli_terms({'terms': [('Z', 0), ('X', 1)], 'coefficients': [1.0, 2.0]}, 2)
+        self.assertEqual(terms, [(0, 1, 0, 1.0), (2, 0, 0, 2.0)])
+
+    def test_counts_expectation_rejects_off_diagonal_terms(self):
+        self.assertAlmostEqual(counts_expectation({'00': 3, '01': 1}, pauli_terms([('IZ', 1.0)], 2)), 0.5)
+        with self.assertRaises(ValueError):
+            counts_expectation({'00': 1}, pauli_terms([('XI', 1.0)], 2))
+
+    def test_statevector_estimator_finds_ground_state(self):
+        result = run_vqe({'num_qubits': 1, 'ansatz_depth': 1, 'hamiltonian': [('Z', 1.0)]})
+        self.assertGreater(result['result_counts'].get('1', 0), 950, "VQE did not reach the ground state")
+
+class TestVQEGradients(unittest.TestCase):
+
+    def test_parameter_shift_matches_finite_differences(self):
+        compiled_ansatz = cached_transpile(build_ansatz(2, 2, measure=False), get_backend(method='statevector'))
+        terms = pauli_terms([('XZ', 1.0), ('ZI', 0.3)], 2)
+        evaluate = lambda param_sets: pauli_expectation(run_statevectors(compiled_ansatz, param_sets), terms)
+        params = np.array([0.1, 0.7, -0.4, 1.3])
+        
+        value, gradient = parameter_shift_gradient(evaluate, params)
+        finite_differences = [(evaluate(params + 1e-6 * e)[0] - evaluate(params - 1e-6 * e)[0]) / 2e-6 for e in np.eye(4)]
+        self.assertAlmostEqual(value, evaluate(params)[0])
+        np.testing.assert_allclose(gradient, finite_differences, atol=1e-5)
+
+    def test_gradient_optimizers(self):
+        for optimizer in ('L-BFGS-B', 'adam', 'spsa'):
+            result = run_vqe({'num_qubits': 1, 'ansatz_depth': 1, 'hamiltonian': [('Z', 1.0)],
+                              'optimizer': optimizer, 'seed': 7})
+            self.assertGreater(result['result_counts'].get('1', 0), 900, f"{optimizer} did not reach the ground state")
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from scripts import preprocess_dataset
+from scripts.preprocess_dataset import preprocess_file, read_parsed_manifest
+
+class TestStreamingPreprocessing(unittest.TestCase):
+    
+    def test_chunked_output_matches_single_chunk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            whole_path = os.path.join(directory, 'whole.csv')
+            chunked_path = os.path.join(directory, 'chunked.csv')
+            rows = preprocess_file('data/raw/dataset.csv', whole_path, chunk_size=10 ** 6)
+            self.assertEqual(preprocess_file('data/raw/dataset.csv', chunked_path, chunk_size=7), rows)
+            with open(whole_path) as whole, open(chunked_path) as chunked:
+                self.assertEqual(whole.read(), chunked.read())
+            self.assertFalse(os.path.exists(chunked_path + '.partial'))
+    
+    def test_parsed_cache_is_invalidated_by_raw_hash(self):
+        with tempfile.TemporaryDirectory() as directory:
+            raw_path = os.path.join(directory, 'raw.csv')
+            output_path = os.path.join(directory, 'preprocessed.csv')
+            parsed_path = os.path.join(directory, 'parsed.parquet')
+            shutil.copy('data/raw/dataset.csv', raw_path)
+            rows = preprocess_file(raw_path, output_path, chunk_size=10, parsed_path=parsed_path)
+            self.assertEqual(read_parsed_manifest(parsed_path)['parts'], (rows + 9) // 10)
+            
+            # An unchanged raw file is not preprocessed again
+            with patch.object(preprocess_dataset, 'preprocess_dataset') as preprocess:
+                self.assertEqual(preprocess_file(raw_path, output_path, parsed_path=parsed_path), rows)
+                preprocess.assert_not_called()
+            
+            with open(raw_path, 'a') as f:
+                f.write('\n99,Factorization,"{number: 91}",Shor,0.01,0.9\n')
+            self.assertEqual(preprocess_file(raw_path, output_path, parsed_path=parsed_path), rows + 1)
+            self.assertEqual(read_parsed_manifest(parsed_path)['rows'], rows + 1)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from scripts import run_experiment
+from scripts.preprocess_dataset import preprocess_file
+from src.utils.result_cache import configure_result_cache, result_cache_config
+from scripts.run_experiment import load_checkpoint, load_dataset, row_keys, run_batched_rows, run_row, run_rows
+
+class TestParallelRunner(unittest.TestCase):
+    
+    def test_results_keep_input_order(self):
+        tasks = [
+            ('Factorization', "{'number': 15}", None),
+            ('Phase Estimation', "{'unitary': 'U', 'eigenvalue': 0.5}", None),
+            ('Factorization', "{'number': 21}", None),
+        ]
+        results = run_rows(tasks, workers=2, chunk_size=1)
+        self.assertEqual([result['algorithm'] for result in results], ['Shor', 'QPE', 'Shor'])
+        self.assertEqual(results[0]['factor1'] * results[0]['factor2'], 15)
+        self.assertEqual(results[2]['factor1'] * results[2]['factor2'], 21)
+        self.assertTrue(all(result['error'] is None for result in results))
+    
+    def test_row_timeout_stops_simulator_jobs(self):
+        # Factoring 77 spends minutes inside one simulator job, which a signal cannot interrupt
+        tasks = [
+            ('Factorization', {'number': 77, 'seed': 1, 'max_qubits': 21}, 2),
+            ('Factorization', {'number': 15}, 2),
+        ]
+        start_time = time.time()
+        results = run_rows(tasks, workers=1)
+        self.assertLess(time.time() - start_time, 60)
+        self.assertTrue(results[0]['error'].startswith('TimeoutError'))
+        self.assertIsNone(results[0]['accuracy'])
+        self.assertEqual(results[0]['algorithm'], 'Shor')
+        # The replacement worker runs the rest of the rows
+        self.assertIsNone(results[1]['error'])
+        self.assertEqual(results[1]['factor1'] * results[1]['factor2'], 15)
+    
+    def test_rows_are_reported_as_they_complete(self):
+        tasks = [
+            ('Factorization', {'number': 77, 'seed': 1, 'max_qubits': 21}, 5),
+            ('Factorization', {'number': 15}, None),
+            ('Factorization', {'number': 21}, None),
+        ]
+        reported = []
+        results = run_rows(tasks, workers=2, chunk_size=1, callback=lambda position, result: reported.append(position))
+        # The slow first row does not hold back the rows finished while it runs
+        self.assertEqual(reported[-1], 0)
+        self.assertEqual(sorted(reported), [0, 1, 2])
+        self.assertEqual([result['factor1'] * result['factor2'] for result in results[1:]], [15, 21])
+    
+    def test_unknown_problem_type_is_recorded(self):
+        result = run_row(('Sorting', "{'n': 4}", None))
+        self.assertIsNone(result['algorithm'])
+        self.assertIn('Unknown problem type', result['error'])
+    
+    def test_pipeline_stages_are_timed(self):
+        search = run_row(('Search', "{'num_qubits': 2, 'target_state': '11'}", None))
+        for stage in ('build', 'compile', 'execute', 'post_process'):
+            self.assertGreaterEqual(search[f'{stage}_time'], 0)
+        self.assertLessEqual(search['build_time'] + search['compile_time'] + search['execute_time'], search['execution_time'])
+        
+        # Entry points that are not pipelined only report their total time
+        factorization = run_row(('Factorization', "{'number': 15}", None))
+        self.assertIsNone(factorization['compile_time'])
+        self.assertIsNone(factorization['error'])
+
+class TestBatchedRows(unittest.TestCase):
+    
+    def test_rows_share_one_job_per_group(self):
+        tasks = [
+            ('Search', "{'n': 4, 'target': 3}", None),
+            ('Factorization', "{'number': 15}", None),
+            ('Phase Estimation', "{'num_qubits': 3, 'target_phase': 0.25}", None),
+            ('Phase Estimation', "{'num_qubits': 2, 'target_phase': 0.5}", None),
+            ('Search', "{'n': 4, 'target': 1}", None),
+        ]
+        with patch.object(run_experiment, 'run_circuits', wraps=run_experiment.run_circuits) as run_circuits:
+            results = run_batched_rows(tasks)
+        # One job for the Grover rows and one per QPE width
+        self.assertEqual(run_circuits.call_count, 3)
+        self.assertEqual(sorted(results), [0, 2, 3, 4])
+        self.assertEqual(results[0]['algorithm'], 'Grover')
+        self.assertEqual(results[2]['algorithm'], 'QPE')
+        for result in results.values():
+            self.assertEqual(sum(result['result_counts'].values()), 1000)
+        self.assertEqual(len(next(iter(results[3]['result_counts']))), 2, "Counts were routed to the wrong row")
+    
+    def test_seeded_rows_match_single_runs(self):
+        parameters = "{'num_qubits': 3, 'target_phase': 0.3, 'seed': 3}"
+        tasks = [
+            ('Phase Estimation', parameters, None),
+            ('Phase Estimation', "{'num_qubits': 3, 'target_phase': 0.3, 'seed': 4}", None),
+            ('Phase Estimation', parameters, None),
+        ]
+        with patch.object(run_experiment, 'run_circuits', wraps=run_experiment.run_circuits) as run_circuits:
+            results = run_batched_rows(tasks)
+        # Identical seeded rows are simulated once
+        self.assertEqual(run_circuits.call_count, 2)
+        self.assertEqual(results[0]['result_counts'], results[2]['result_counts'])
+        self.assertEqual(results[0]['result_counts'], run_row(tasks[0])['result_counts'])
+        self.assertEqual(results[1]['result_counts'], run_row(tasks[1])['result_counts'])
+    
+    def test_failed_group_is_left_to_the_runner(self):
+        tasks = [
+            ('Search', "{'n': 4, 'target': 3}", None),
+            ('Phase Estimation', "{'num_qubits': 3, 'target_phase': 0.25}", None),
+            ('Phase Estimation', "{'num_qubits': 3, 'target_phase': 0.5}", None),
+        ]
+        run_circuits = run_experiment.run_circuits
+        def flaky_run_circuits(circuits, **kwargs):
+            if circuits[0].num_qubits == 3:
+                raise RuntimeError("simulator crashed")
+            return run_circuits(circuits, **kwargs)
+        with patch.object(run_experiment, 'run_circuits', flaky_run_circuits):
+            results = run_batched_rows(tasks)
+        self.assertEqual(sorted(results), [0])
+        self.assertIsNone(run_row(tasks[1])['error'])
+    
+    def test_batched_accuracy_matches_entry_point(self):
+        parameters = "{'num_qubits': 2, 'target_state': '11'}"
+        batched = run_batched_rows([('Search', parameters, None)])[0]
+        single = run_row(('Search', parameters, None))
+        self.assertEqual(set(batched), set(single))
+        self.assertAlmostEqual(batched['accuracy'], single['accuracy'], delta=0.1)
+
+class TestLoadDataset(unittest.TestCase):
+    
+    def test_parsed_cache_matches_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, 'preprocessed.csv')
+            parsed_path = os.path.join(directory, 'parsed.parquet')
+            preprocess_file('data/raw/dataset.csv', output_path, chunk_size=8, parsed_path=parsed_path)
+            from_csv = load_dataset(output_path)
+            from_parquet = load_dataset(parsed_path)
+        self.assertEqual(from_parquet['parameters'].tolist(), from_csv['parameters'].tolist())
+        self.assertEqual(from_parquet['problem_type'].tolist(), from_csv['problem_type'].tolist())
+        self.assertEqual(row_keys(list(zip(from_parquet['problem_type'], from_parquet['parameters'], [None] * len(from_parquet)))),
+                         row_keys(list(zip(from_csv['problem_type'], from_csv['parameters'], [None] * len(from_csv)))))
+
+class TestCheckpointedRuns(unittest.TestCase):
+    
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.df = pd.DataFrame({
+            'problem_type': ['Factorization', 'Factorization', 'Factorization'],
+            'parameters': ["{'number': 15}", "{'number': 21}", "{'number': 15}"]
+        })
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def test_row_keys_tell_duplicates_apart(self):
+        keys = row_keys([(problem_type, parameters, None) for problem_type, parameters in zip(self.df['problem_type'], self.df['parameters'])])
+        self.assertEqual(len(set(keys)), 3)
+        self.assertEqual(keys[0].split(':')[0], keys[2].split(':')[0])
+    
+    def test_interrupted_run_resumes_remaining_rows(self):
+        calls = []
+        def flaky_shor(parameters):
+            calls.append(parameters['number'])
+            if parameters['number'] == 21 and len(calls) == 2:
+                raise KeyboardInterrupt
+            return {'accuracy': 1.0}
+        
+        with patch.dict(run_experiment.ALGORITHMS, {'Factorization': ('Shor', flaky_shor)}):
+            with self.assertRaises(KeyboardInterrupt):
+                run_experiment.run_experiment(self.df, workers=1)
+            self.assertEqual(len(load_checkpoint()), 1)
+            with open(run_experiment.MANIFEST_PATH) as f:
+                self.assertEqual(json.load(f)['status'], 'interrupted')
+            
+            run_experiment.run_experiment(self.df, workers=1)
+        
+        # The first row is not repeated after the restart
+        self.assertEqual(calls, [15, 21, 21, 15])
+        with open(run_experiment.MANIFEST_PATH) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['status'], 'complete')
+        self.assertEqual(manifest['resumed_rows'], 1)
+        self.assertEqual(len(pd.read_parquet(run_experiment.RESULTS_TABLE_PATH)), 3)
+    
+    def test_truncated_checkpoint_line_is_dropped(self):
+        os.makedirs(os.path.dirname(run_experiment.CHECKPOINT_PATH))
+        with open(run_experiment.CHECKPOINT_PATH, 'w') as f:
+            f.write(json.dumps({'key': 'a:1', 'result': {'error': None}}) + '\n')
+            f.write('{"key": "b:1", "res')
+        self.assertEqual(list(load_checkpoint()), ['a:1'])
+        with open(run_experiment.CHECKPOINT_PATH) as f:
+            self.assertTrue(f.read().endswith('\n'))
+
+class TestResultCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.previous = result_cache_config()
+        configure_result_cache(self.directory.name)
+    
+    def tearDown(self):
+        configure_result_cache(self.previous['directory'], self.previous['max_bytes'])
+        self.directory.cleanup()
+    
+    def test_seeded_rerun_is_served_from_cache(self):
+        tasks = [
+            ('Search', {'num_qubits': 3, 'target_state': '101', 'seed': 11}, None),
+            ('Search', {'num_qubits': 3, 'target_state': '011', 'seed': 11}, None),
+        ]
+        first = run_batched_rows(tasks)
+        with patch.object(run_experiment, 'run_circuits') as run_circuits:
+            second = run_batched_rows(tasks)
+            run_circuits.assert_not_called()
+        self.assertEqual([result['result_counts'] for result in first.values()], [result['result_counts'] for result in second.values()])
+        self.assertFalse(first[0]['cached'])
+        self.assertTrue(second[0]['cached'])
+    
+    def test_unseeded_rows_are_rerun(self):
+        calls = []
+        def shor(parameters):
+            calls.append(parameters['number'])
+            return {'accuracy': 1.0}
+        
+        with patch.dict(run_experiment.ALGORITHMS, {'Factorization': ('Shor', shor)}):
+            for _ in range(2):
+                run_row(('Factorization', {'number': 15}, None))
+                run_row(('Factorization', {'number': 21, 'seed': 3}, None))
+        self.assertEqual(calls, [15, 21, 15])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+from src.algorithms.grover import build_grover_circuit, run_grover
+from src.algorithms.submission import submit_grover, submit_shor
+from src.utils import async_jobs
+from src.utils.async_jobs import JobWindow, submit_circuits
+from src.utils.batch import run_circuits
+
+class TestAsyncJobs(unittest.TestCase):
+    
+    def test_window_bounds_in_flight_jobs(self):
+        observed = []
+        compile_circuits = async_jobs._compile
+        def observed_compile(circuits):
+            observed.append(window.in_flight)
+            return compile_circuits(circuits)
+        
+        async def main():
+            circuits = [build_grover_circuit({'num_qubits': 3, 'target_state': '101'}) for _ in range(8)]
+            return await asyncio.gather(*[window.submit([qc], seed=7) for qc in circuits])
+        
+        window = JobWindow(max_in_flight=2)
+        with patch.object(async_jobs, '_compile', observed_compile):
+            results = asyncio.run(main())
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(max(observed), window.max_in_flight, "More jobs were submitted than the window allows")
+        self.assertEqual(window.in_flight, 0)
+        with self.assertRaises(ValueError):
+            JobWindow(max_in_flight=0)
+    
+    def test_compilation_leaves_the_event_loop(self):
+        loop_threads = []
+        compile_circuits = async_jobs._compile
+        def compile_thread(circuits):
+            loop_threads.append(threading.get_ident())
+            return compile_circuits(circuits)
+        
+        async def main():
+            loop_threads.append(threading.get_ident())
+            return await JobWindow().submit([build_grover_circuit({'num_qubits': 2})])
+        
+        with patch.object(async_jobs, '_compile', compile_thread):
+            asyncio.run(main())
+        self.assertNotEqual(loop_threads[0], loop_threads[1], "Circuits were compiled on the event loop thread")
+    
+    def test_submissions_match_blocking_runs(self):
+        parameters = {'num_qubits': 3, 'target_state': '101', 'seed': 5}
+        circuits = [build_grover_circuit(parameters), build_grover_circuit({'num_qubits': 2})]
+        
+        async def main():
+            return await asyncio.gather(submit_grover(parameters), submit_circuits(circuits, seed=5), submit_shor({'number': 15}))
+        
+        grover, counts, shor = asyncio.run(main())
+        self.assertEqual(grover, run_grover(parameters))
+        self.assertEqual(counts, run_circuits(circuits, seed=5))
+        self.assertEqual(shor['factor1'] * shor['factor2'], 15)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import threading
+import unittest
+from qiskit import QuantumCircuit
+from src.algorithms.quantum_error_correction import run_quantum_error_correction
+from src.utils.backend import backend_for, configure_backend, get_backend, reset_backends
+
+class TestBackend(unittest.TestCase):
+
+    def tearDown(self):
+        reset_backends()
+
+    def test_backend_is_reused(self):
+        self.assertIs(get_backend(), get_backend(), "Backend is not reused within a thread")
+
+    def test_backend_per_thread(self):
+        backends = []
+        thread = threading.Thread(target=lambda: backends.append(get_backend()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(backends[0], get_backend(), "Backend is shared across threads")
+
+    def test_configure_backend(self):
+        configure_backend(method='statevector', precision='single')
+        backend = get_backend()
+        self.assertEqual(backend.options.method, 'statevector', "Backend method not applied")
+        self.assertEqual(backend.options.precision, 'single', "Backend precision not applied")
+
+    def test_clifford_circuits_use_stabilizer(self):
+        clifford = QuantumCircuit(2, 2)
+        clifford.h(0)
+        clifford.cx(0, 1)
+        clifford.measure([0, 1], [0, 1])
+        other = QuantumCircuit(2)
+        other.t(0)
+        self.assertEqual(backend_for(clifford).options.method, 'stabilizer')
+        self.assertEqual(backend_for(other).options.method, 'automatic')
+        self.assertEqual(backend_for([clifford, other]).options.method, 'automatic')
+        configure_backend(method='statevector')
+        self.assertEqual(backend_for(clifford).options.method, 'statevector', "Configured method was overridden")
+
+    def test_wide_clifford_circuit(self):
+        # Far beyond what a dense statevector fits in memory
+        result = run_quantum_error_correction({'num_qubits': 60})
+        self.assertEqual(result['result_counts'], {'0' * 60: 1000})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.data_processing import (
+    parameter_columns, parameters_from_columns, parse_parameter_string, parse_parameters, parse_parameters_column
+)
+
+class TestParameterParsing(unittest.TestCase):
+    
+    def test_mini_syntax(self):
+        self.assertEqual(parse_parameter_string("{n: 4, target: 3}"), {'n': 4, 'target': 3})
+        self.assertEqual(parse_parameter_string("{'unitary': 'A', 'eigenvalue': 0.1}"), {'unitary': 'A', 'eigenvalue': 0.1})
+        self.assertEqual(parse_parameter_string("{problem: 'Traveling Salesman'}"), {'problem': 'Traveling Salesman'})
+        # Colons inside strings are not mistaken for keys
+        self.assertEqual(parse_parameter_string("{label: 'a: b', flag: True, graph: [[0, 1]]}"), {'label': 'a: b', 'flag': True, 'graph': [[0, 1]]})
+    
+    def test_invalid_strings(self):
+        with self.assertRaises(ValueError):
+            parse_parameter_string("{n: 4,")
+        with self.assertRaises(ValueError):
+            parse_parameter_string("[1, 2]")
+        self.assertEqual(parse_parameters("{n: 4,"), {})
+    
+    def test_column_collects_errors(self):
+        column = pd.Series(["{n: 4}", "{n: 4}", "oops", None, "{number: 15}"], index=[10, 11, 12, 13, 14])
+        parsed, report = parse_parameters_column(column)
+        self.assertEqual(parsed.tolist(), [{'n': 4}, {'n': 4}, {}, {}, {'number': 15}])
+        self.assertEqual(list(parsed.index), [10, 11, 12, 13, 14])
+        self.assertEqual(report['index'].tolist(), [12, 13])
+        self.assertEqual(report['parameters'].tolist()[0], "oops")
+    
+    def test_rows_do_not_share_dicts(self):
+        column = pd.Series(["{n: 4}", "{n: 4}", "oops", "oops"])
+        parsed, _ = parse_parameters_column(column)
+        parsed[0]['n'] = 5
+        parsed[2]['n'] = 5
+        self.assertEqual(parsed[1], {'n': 4})
+        self.assertEqual(parsed[3], {})
+        self.assertEqual(parse_parameter_string("{n: 4}"), {'n': 4})
+        self.assertEqual(parse_parameters_column(column)[0].tolist(), [{'n': 4}, {'n': 4}, {}, {}])
+
+class TestParameterColumns(unittest.TestCase):
+    
+    def test_round_trip_through_parquet(self):
+        parameters = pd.Series([
+            {'n': 4, 'target': 3},
+            {'number': 15},
+            {'unitary': 'A', 'eigenvalue': 0.1},
+            {'graph': [[0, 1], [1, 2]], 'flag': True},
+        ])
+        columns = parameter_columns(parameters)
+        self.assertEqual(str(columns['param_n'].dtype), 'Int64')
+        self.assertEqual(str(columns['param_eigenvalue'].dtype), 'Float64')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'parameters.parquet')
+            columns.to_parquet(path)
+            rebuilt = parameters_from_columns(pd.read_parquet(path))
+        self.assertEqual(rebuilt, parameters.tolist())
+        self.assertIs(type(rebuilt[0]['n']), int)
+        self.assertIs(type(rebuilt[3]['graph'][0][0]), int)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
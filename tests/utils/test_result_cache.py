@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from src.utils.result_cache import configure_result_cache, load_result, result_cache_config, result_key, store_result
+
+class TestResultCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.previous = result_cache_config()
+        configure_result_cache(self.directory.name, max_bytes=1 << 20)
+    
+    def tearDown(self):
+        configure_result_cache(self.previous['directory'], self.previous['max_bytes'])
+        self.directory.cleanup()
+    
+    def test_key_covers_shots_and_seed(self):
+        parameters = {'num_qubits': 3, 'target_state': '101', 'seed': 7}
+        key = result_key('Grover', parameters)
+        self.assertEqual(key, result_key('Grover', dict(reversed(list(parameters.items())))))
+        self.assertEqual(key, result_key('Grover', dict(parameters, plot=False)))
+        self.assertEqual(key, result_key('Grover', dict(parameters, shots=1000)))
+        self.assertNotEqual(key, result_key('Grover', dict(parameters, shots=2000)))
+        self.assertNotEqual(key, result_key('Grover', dict(parameters, seed=8)))
+        self.assertNotEqual(key, result_key('QPE', parameters))
+    
+    def test_results_round_trip(self):
+        key = result_key('Shor', {'number': 15, 'seed': 1})
+        self.assertIsNone(load_result(key))
+        store_result(key, {'factor1': 3, 'factor2': 5})
+        self.assertEqual(load_result(key), {'factor1': 3, 'factor2': 5})
+        configure_result_cache(None)
+        self.assertIsNone(load_result(key), "Disabled cache returned a result")
+    
+    def test_least_recently_used_results_are_evicted(self):
+        configure_result_cache(self.directory.name, max_bytes=3000)
+        keys = [result_key('Grover', {'seed': seed}) for seed in range(3)]
+        store_result(keys[0], b'0' * 1000)
+        store_result(keys[1], b'1' * 1000)
+        # Make the second result the least recently used one
+        os.utime(os.path.join(self.directory.name, keys[1][:2], keys[1] + '.pkl'), (0, 0))
+        store_result(keys[2], b'2' * 1000)
+        self.assertIsNone(load_result(keys[1]))
+        self.assertEqual(load_result(keys[0]), b'0' * 1000)
+        self.assertEqual(load_result(keys[2]), b'2' * 1000)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+from src.utils.result_store import counts_by_row, read_counts, read_results, write_results
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.table_path = os.path.join(self.directory.name, 'results.parquet')
+        self.counts_path = os.path.join(self.directory.name, 'counts.parquet')
+        self.results = [
+            {'result_counts': {'00': 600, '11': 400}, 'algorithm': 'Grover', 'accuracy': 0.4, 'error': None},
+            {'factor1': 3, 'factor2': 5, 'algorithm': 'Shor', 'accuracy': 1.0, 'error': None},
+            {'result_counts': {'101': 1000}, 'algorithm': 'QPE', 'accuracy': 1.0, 'error': None},
+        ]
+        write_results(self.results, self.table_path, self.counts_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_counts_round_trip(self):
+        counts = counts_by_row(read_counts(self.counts_path))
+        self.assertEqual(counts, {0: {'00': 600, '11': 400}, 2: {'101': 1000}})
+        self.assertEqual(counts_by_row(read_counts(self.counts_path, rows=[2])), {2: {'101': 1000}})
+
+    def test_column_projection(self):
+        results_df = read_results(self.table_path, columns=['algorithm', 'accuracy', 'missing'])
+        self.assertEqual(list(results_df.columns), ['algorithm', 'accuracy'])
+        self.assertEqual(results_df['algorithm'].tolist(), ['Grover', 'Shor', 'QPE'])
+        self.assertNotIn('result_counts', read_results(self.table_path).columns)
+
+if __name__ == "__main__":
+    unittest.main()
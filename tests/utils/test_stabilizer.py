@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+from src.algorithms.bernstein import run_bernstein
+from src.algorithms.simon import run_simon
+from src.utils.stabilizer import exact_distribution, is_clifford_circuit, sample_counts
+
+def random_clifford_circuit(rng, num_qubits, depth):
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    for _ in range(depth):
+        if num_qubits > 1 and rng.random() < 0.4:
+            a, b = (int(q) for q in rng.choice(num_qubits, 2, replace=False))
+            getattr(qc, rng.choice(['cx', 'cy', 'cz', 'swap']))(a, b)
+        else:
+            getattr(qc, rng.choice(['h', 's', 'sdg', 'x', 'y', 'z', 'sx', 'sxdg']))(int(rng.integers(num_qubits)))
+    return qc
+
+class TestStabilizer(unittest.TestCase):
+    
+    def test_matches_statevector(self):
+        rng = np.random.default_rng(1)
+        for _ in range(100):
+            num_qubits = int(rng.integers(1, 6))
+            qc = random_clifford_circuit(rng, num_qubits, int(rng.integers(0, 30)))
+            expected = {bitstring: p for bitstring, p in Statevector(qc).probabilities_dict().items() if p > 1e-9}
+            qc.measure(range(num_qubits), range(num_qubits))
+            distribution = exact_distribution(qc)
+            self.assertEqual(set(distribution), set(expected), f"Wrong support for\n{qc}")
+            for bitstring, p in expected.items():
+                self.assertAlmostEqual(distribution[bitstring], p)
+    
+    def test_mid_circuit_measurements(self):
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.measure(0, 0)
+        qc.cx(0, 1)
+        qc.measure(1, 1)
+        self.assertEqual(exact_distribution(qc), {'00': 0.5, '11': 0.5})
+    
+    def test_non_clifford_gates_are_rejected(self):
+        qc = QuantumCircuit(1, 1)
+        qc.t(0)
+        qc.measure(0, 0)
+        self.assertFalse(is_clifford_circuit(qc))
+        with self.assertRaises(ValueError):
+            exact_distribution(qc)
+    
+    def test_resets_are_rejected(self):
+        # The tableau has no reset, so such circuits must not be routed to it
+        qc = QuantumCircuit(1, 1)
+        qc.h(0)
+        qc.reset(0)
+        qc.measure(0, 0)
+        self.assertFalse(is_clifford_circuit(qc))
+    
+    def test_composite_gates_are_inspected(self):
+        bell = QuantumCircuit(2, name='bell')
+        bell.h(0)
+        bell.cx(0, 1)
+        qc = QuantumCircuit(2, 2)
+        qc.append(bell.to_gate(), [0, 1])
+        qc.measure([0, 1], [0, 1])
+        self.assertTrue(is_clifford_circuit(qc))
+        self.assertEqual(exact_distribution(qc), {'00': 0.5, '11': 0.5})
+    
+    def test_wide_circuits(self):
+        result = run_bernstein({'hidden_string': '1101' * 30, 'exact': True})
+        self.assertAlmostEqual(sum(result['result_counts'].values()), 1.0)
+        self.assertEqual(len(result['result_counts']), 2)
+        
+        parameters = {'hidden_string': '1' * 100, 'exact': True}
+        with self.assertRaises(ValueError):
+            run_simon(parameters)
+        counts = run_simon(dict(parameters, shots=500, seed=2))['result_counts']
+        self.assertEqual(sum(counts.values()), 500)
+        self.assertEqual(counts, run_simon(dict(parameters, shots=500, seed=2))['result_counts'])
+    
+    def test_samples_follow_distribution(self):
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+        counts = sample_counts(qc, shots=2000, seed=5)
+        self.assertEqual(set(counts), {'00', '11'})
+        self.assertAlmostEqual(counts['00'] / 2000, 0.5, delta=0.05)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+import unittest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from src.utils.backend import get_backend
+from src.utils.transpile_cache import (
+    cached_transpile, circuit_fingerprint, clear_transpile_cache,
+    set_transpile_cache_size, transpile_cache_info
+)
+
+def build_circuit(num_qubits, angle=0.5):
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.h(range(num_qubits))
+    qc.rz(angle, 0)
+    qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+class TestTranspileCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_transpile_cache()
+
+    def tearDown(self):
+        set_transpile_cache_size(256)
+        clear_transpile_cache()
+
+    def test_fingerprint_is_structural(self):
+        self.assertEqual(circuit_fingerprint(build_circuit(3)), circuit_fingerprint(build_circuit(3)))
+        self.assertNotEqual(circuit_fingerprint(build_circuit(3)), circuit_fingerprint(build_circuit(4)))
+        self.assertNotEqual(circuit_fingerprint(build_circuit(3)), circuit_fingerprint(build_circuit(3, 0.25)))
+
+    def test_cache_hits_for_identical_circuits(self):
+        simulator = get_backend()
+        first = cached_transpile(build_circuit(3), simulator)
+        second = cached_transpile(build_circuit(3), simulator)
+        self.assertIs(first, second, "Identical circuits were transpiled twice")
+        info = transpile_cache_info()
+        self.assertEqual((info['hits'], info['misses']), (1, 1))
+
+    def test_hit_uses_the_callers_parameters(self):
+        simulator = get_backend()
+        circuits = []
+        for _ in range(2):
+            qc = QuantumCircuit(1, 1)
+            qc.rx(Parameter('theta'), 0)
+            qc.measure(0, 0)
+            circuits.append(qc)
+        cached_transpile(circuits[0], simulator)
+        compiled_circuit = cached_transpile(circuits[1], simulator)
+        self.assertEqual(transpile_cache_info()['hits'], 1)
+        theta = circuits[1].parameters[0]
+        self.assertIn(theta, set(compiled_circuit.parameters))
+        result = simulator.run(compiled_circuit, parameter_binds=[{theta: [0.1, 0.2]}], shots=10).result()
+        self.assertEqual(len(result.results), 2)
+
+    def test_lru_eviction(self):
+        set_transpile_cache_size(2)
+        simulator = get_backend()
+        for num_qubits in (2, 3, 4):
+            cached_transpile(build_circuit(num_qubits), simulator)
+        self.assertEqual(transpile_cache_info()['size'], 2)
+        cached_transpile(build_circuit(2), simulator)
+        self.assertEqual(transpile_cache_info()['misses'], 4, "Least recently used entry was not evicted")
+
+if __name__ == "__main__":
+    unittest.main()
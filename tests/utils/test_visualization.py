@@ -0,0 +1,27 @@
+import os
+import tempfile
+import unittest
+from src.utils.visualization import plot_counts, plotting_enabled, set_plotting
+
+class TestVisualization(unittest.TestCase):
+
+    def tearDown(self):
+        set_plotting(False)
+
+    def test_headless_by_default(self):
+        self.assertFalse(plotting_enabled(), "Plotting should be opt-in")
+        self.assertIsNone(plot_counts({'00': 10, '11': 5}), "Headless mode produced a figure")
+
+    def test_plotting_saves_histogram(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            set_plotting(True, output_dir=output_dir)
+            figure = plot_counts({'00': 10, '11': 5}, name='bell')
+            self.assertIsNotNone(figure, "Plotting mode produced no figure")
+            self.assertTrue(os.path.exists(os.path.join(output_dir, 'bell.png')), "Histogram was not saved")
+
+    def test_per_call_override(self):
+        set_plotting(True)
+        self.assertIsNone(plot_counts({'0': 1}, plot=False), "Per-call override was ignored")
+
+if __name__ == "__main__":
+    unittest.main()